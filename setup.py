@@ -35,11 +35,17 @@ setup(
             "pytest>=7.4.4",
             "pytest-asyncio>=0.21.1",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.5.0",
+            "pytest-testmon>=2.1.0",
+            "fakeredis>=2.20.0",
             "black>=24.1.0",
             "flake8>=7.0.0",
             "mypy>=1.8.0",
             "pre-commit>=3.6.0",
         ],
+        "routing": [
+            "pyahocorasick>=2.0.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -77,6 +77,10 @@ class Settings(BaseSettings):
     # Webhooks
     webhook_base_url: Optional[str] = Field(default=None, env="WEBHOOK_BASE_URL")
     
+    # Workflows
+    workflow_max_concurrency: int = Field(default=10, env="WORKFLOW_MAX_CONCURRENCY")
+    digest_cache_ttl: int = Field(default=60, env="DIGEST_CACHE_TTL")
+    
     @validator("cors_origins", pre=True)
     def parse_cors_origins(cls, v):
         if isinstance(v, str):
@@ -9,6 +9,7 @@ from typing import Dict, Any, Optional
 from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 import asyncio
+import httpx
 
 from src.config import get_settings
 from src.tools.notion_tools import NotionTools
@@ -385,8 +386,6 @@ async def handle_sync_command(text: str, user_id: str, channel_id: str, response
 async def send_command_response(response_url: str, text: str) -> None:
     """Send response to Slack command using response_url."""
     try:
-        import httpx
-        
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 response_url,
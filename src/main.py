@@ -11,7 +11,7 @@ from agno.models.openai import OpenAI
 from agno.storage.agent import AgentStorage
 
 from src.config import Settings, get_settings
-from src.tools.notion_tools import NotionTools
+from src.tools.notion_tools import NotionTools, close_notion_clients
 from src.tools.slack_tools import SlackTools
 from src.api.routes import api_router
 from src.services.monitoring import setup_monitoring
@@ -61,6 +61,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Notion-Slack AI Agent...")
+    close_notion_clients()
 
 # Create FastAPI app
 app = FastAPI(
@@ -1,6 +1,7 @@
 """
 Rate limiting service for the Notion-Slack AI Agent.
 """
+import asyncio
 import time
 import redis
 from typing import Optional, Dict, Any, Tuple
@@ -224,6 +225,53 @@ class RateLimiter:
         
         return None
 
+class AsyncTokenBucket:
+    """
+    In-process token bucket for pacing outbound API calls.
+    
+    Unlike a semaphore, which caps how many calls are in flight, this caps the
+    sustained request rate: at most ``max_rate`` calls per ``time_period``
+    seconds, with bursts of up to ``max_rate``.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._fill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._updated_at = time.monotonic()
+        # asyncio.Lock binds to the loop it first waits on; keep one per running loop
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.max_rate,
+                    self._tokens + (now - self._updated_at) * self._fill_rate
+                )
+                self._updated_at = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
 class AdaptiveRateLimiter:
     """Advanced rate limiter with adaptive limits based on system load."""
     
@@ -351,7 +399,6 @@ def require_rate_limit(limit_type: str = "api", custom_limit: Optional[RateLimit
             # For now, it's a placeholder
             return func(*args, **kwargs)
         
-        import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         else:
@@ -2,18 +2,43 @@
 Notion-specific tools for the AI agent.
 """
 import asyncio
-from typing import List, Dict, Any, Optional
+import functools
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from agno.tools import Tool
 from notion_client import Client as NotionClient
 from src.config import get_settings
 
+# Workspace search results; a short TTL so new pages show up quickly.
+# Keyed by client so tools with different tokens never share results.
+SEARCH_CACHE_TTL = 60
+SEARCH_CACHE_MAX_ENTRIES = 256
+_SEARCH_CACHE: Dict[Tuple[Any, str, Optional[str]], Tuple[float, List[Dict]]] = {}
+
+# Every client handed out by _notion_client, for close_notion_clients()
+_OPEN_CLIENTS: List[NotionClient] = []
+
+@functools.lru_cache(maxsize=None)
+def _notion_client(token: str) -> NotionClient:
+    """Get the Notion client for a token, shared by every NotionTools using it."""
+    client = NotionClient(auth=token)
+    _OPEN_CLIENTS.append(client)
+    return client
+
+def close_notion_clients() -> None:
+    """Close the shared Notion clients' HTTP connections; call once at app shutdown."""
+    _notion_client.cache_clear()
+    _SEARCH_CACHE.clear()
+    while _OPEN_CLIENTS:
+        _OPEN_CLIENTS.pop().close()
+
 class NotionTools(Tool):
     """Tools for interacting with Notion API."""
 
     def __init__(self):
         super().__init__()
         settings = get_settings()
-        self.client = NotionClient(auth=settings.notion_integration_token)
+        self.client = _notion_client(settings.notion_integration_token)
 
     def create_page(self, 
                    parent_database_id: str,
@@ -32,6 +57,7 @@ class NotionTools(Tool):
             }
 
             response = self.client.pages.create(**page_data)
+            self._invalidate_search_cache()
             return {
                 "success": True,
                 "page_id": response["id"],
@@ -68,6 +94,42 @@ class NotionTools(Tool):
         except Exception as e:
             return [{"error": str(e)}]
 
+    def query_database_page(self,
+                           database_id: str,
+                           filter_conditions: Optional[Dict] = None,
+                           sorts: Optional[List[Dict]] = None,
+                           start_cursor: Optional[str] = None,
+                           page_size: int = 100) -> Dict[str, Any]:
+        """Query one page of a Notion database, returning the pagination cursor."""
+        try:
+            query_params = {"database_id": database_id, "page_size": page_size}
+            if filter_conditions:
+                query_params["filter"] = filter_conditions
+            if sorts:
+                query_params["sorts"] = sorts
+            if start_cursor:
+                query_params["start_cursor"] = start_cursor
+
+            response = self.client.databases.query(**query_params)
+            return {
+                "success": True,
+                "results": [{
+                    "id": page["id"],
+                    "properties": page["properties"],
+                    "url": page["url"],
+                    "created_time": page["created_time"],
+                    "last_edited_time": page["last_edited_time"]
+                } for page in response["results"]],
+                "next_cursor": response.get("next_cursor"),
+                "has_more": response.get("has_more", False)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"Failed to query database: {database_id}"
+            }
+
     def update_page(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing Notion page."""
         try:
@@ -75,6 +137,7 @@ class NotionTools(Tool):
                 page_id=page_id,
                 properties=properties
             )
+            self._invalidate_search_cache()
             return {
                 "success": True,
                 "page_id": response["id"],
@@ -132,14 +195,24 @@ class NotionTools(Tool):
     def search_pages(self, 
                     query: str, 
                     filter_type: Optional[str] = None) -> List[Dict]:
-        """Search for pages in the workspace."""
+        """Search for pages in the workspace, reusing recent results within the cache TTL.
+        
+        Pages created or updated through NotionTools invalidate the cache; edits
+        made elsewhere, e.g. in the Notion app, show up once the TTL expires.
+        """
+        cache_key = (self.client, query, filter_type)
+        now = time.monotonic()
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached and now - cached[0] < SEARCH_CACHE_TTL:
+            return [dict(result) for result in cached[1]]
+        
         try:
             search_params = {"query": query}
             if filter_type:
                 search_params["filter"] = {"property": "object", "value": filter_type}
             
             response = self.client.search(**search_params)
-            return [{
+            results = [{
                 "id": result["id"],
                 "object": result["object"],
                 "url": result.get("url", ""),
@@ -148,6 +221,19 @@ class NotionTools(Tool):
             } for result in response["results"]]
         except Exception as e:
             return [{"error": str(e)}]
+        
+        # Only successful searches are cached; evict the oldest entry when full
+        _SEARCH_CACHE.pop(cache_key, None)
+        if len(_SEARCH_CACHE) >= SEARCH_CACHE_MAX_ENTRIES:
+            _SEARCH_CACHE.pop(next(iter(_SEARCH_CACHE)))
+        _SEARCH_CACHE[cache_key] = (now, results)
+        # Callers get copies so mutating a result can't corrupt the cache
+        return [dict(result) for result in results]
+
+    def _invalidate_search_cache(self) -> None:
+        """Drop cached searches made with this client after a page write."""
+        for cache_key in [key for key in _SEARCH_CACHE if key[0] is self.client]:
+            del _SEARCH_CACHE[cache_key]
 
     def get_database_schema(self, database_id: str) -> Dict[str, Any]:
         """Get the schema/structure of a Notion database."""
@@ -169,7 +255,8 @@ class NotionTools(Tool):
                 "message": f"Failed to get database schema: {database_id}"
             }
 
-    def _extract_title(self, notion_object: Dict[str, Any]) -> str:
+    @staticmethod
+    def _extract_title(notion_object: Dict[str, Any]) -> str:
         """Extract title from a Notion object."""
         try:
             if "properties" in notion_object and "Name" in notion_object["properties"]:
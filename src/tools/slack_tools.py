@@ -2,7 +2,7 @@
 Slack-specific tools for the AI agent.
 """
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from agno.tools import Tool
 from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
@@ -19,10 +19,14 @@ class SlackTools(Tool):
     async def send_message(self, 
                           channel: str,
                           text: str,
-                          blocks: Optional[List[Dict]] = None,
+                          blocks: Optional[Union[str, List[Dict]]] = None,
                           thread_ts: Optional[str] = None,
                           attachments: Optional[List[Dict]] = None) -> Dict[str, Any]:
-        """Send a message to a Slack channel or user."""
+        """Send a message to a Slack channel or user.
+        
+        blocks may be a list of block dicts or the same list already
+        serialized to a JSON string, which slack_sdk sends unchanged.
+        """
         try:
             response = await self.client.chat_postMessage(
                 channel=channel,
@@ -2,25 +2,154 @@
 Workflow automation tools for complex Notion-Slack integrations.
 """
 import asyncio
-from typing import Dict, Any, List, Optional, Callable
+import functools
+import re
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Callable, Mapping, Tuple
 from agno.tools import Tool
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 import json
 import logging
+import time
+import redis
+import redis.asyncio as aioredis
 
+try:
+    import ahocorasick
+except ImportError:  # optional: falls back to per-keyword substring checks
+    ahocorasick = None
+
+from src.config import get_settings
 from src.tools.notion_tools import NotionTools
 from src.tools.slack_tools import SlackTools
 from src.services.monitoring import track_notion_api_call, track_slack_api_call, PerformanceMonitor
+from src.services.rate_limiter import AsyncTokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Slack user info changes rarely; cache lookups per process for 30 minutes
+USER_INFO_CACHE_TTL = 1800
+USER_INFO_CACHE_MAX_ENTRIES = 1024
+_USER_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Page title/URL change rarely; cache them for status notifications
+PAGE_META_CACHE_TTL = 300
+PAGE_META_CACHE_MAX_ENTRIES = 1024
+
+DIGEST_CACHE_MAX_ENTRIES = 256
+
+# Request pacing shared by every workflow: Slack matches RateLimiter's
+# "slack_api" limit; Notion averages 3 requests/second
+_SLACK_LIMITER = AsyncTokenBucket(50, 60)
+_NOTION_LIMITER = AsyncTokenBucket(3, 1)
+
+_STATUS_EMOJIS: Mapping[str, str] = MappingProxyType({
+    "not started": "⚪",
+    "in progress": "🟡",
+    "completed": "✅",
+    "blocked": "🔴",
+    "on hold": "⏸️"
+})
+
+def _cache_put(cache: Dict, key: Any, entry: Tuple, max_entries: int) -> None:
+    """Store a TTL cache entry, evicting the oldest entry once the cache is full."""
+    cache.pop(key, None)
+    if len(cache) >= max_entries:
+        cache.pop(next(iter(cache)))
+    cache[key] = entry
+
+# Single mrkdwn section block, pre-serialized; SlackTools.send_message
+# accepts blocks as a JSON string and slack_sdk sends it as-is
+_SECTION_BLOCK_TEMPLATE = '[{"type": "section", "text": {"type": "mrkdwn", "text": %s}}]'
+
+def _wrap_blocks(text: str) -> str:
+    """Wrap text in a single mrkdwn section block, serialized for the Slack API."""
+    return _SECTION_BLOCK_TEMPLATE % json.dumps(text)
+
+# Horizontal whitespace only, so a bare "due:" line never captures the next line
+_DUE_RE = re.compile(r'\b(?:due|deadline)[ \t]*:[ \t]*(.+?)[ \t]*$', re.IGNORECASE | re.MULTILINE)
+
+def _parse_due_date(text: str) -> Optional[str]:
+    """Parse an ISO date (YYYY-MM-DD) from the start of a due date string."""
+    try:
+        return date.fromisoformat(text.split(maxsplit=1)[0]).isoformat()
+    except (ValueError, IndexError):
+        return None
+
+@functools.lru_cache(maxsize=256)
+def _compile_rule_pattern(pattern: str) -> "re.Pattern":
+    """Compile a routing rule pattern once per distinct pattern."""
+    return re.compile(pattern, re.IGNORECASE)
+
+@functools.lru_cache(maxsize=256)
+def _normalize_keywords(keywords: Tuple[str, ...]) -> frozenset:
+    """Lowercase routing keywords once per distinct keyword list.
+    
+    Blank keywords are dropped: an empty string is a substring of every message.
+    """
+    return frozenset(keyword.lower() for keyword in keywords if keyword.strip())
+
+@functools.lru_cache(maxsize=64)
+def _build_keyword_matcher(rule_keywords: Tuple[frozenset, ...]) -> Callable[[str], set]:
+    """
+    Build a matcher returning the indexes of rules with a keyword in a lowercased message.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, so matching
+    is a single pass regardless of how many keywords the ruleset has.
+    """
+    if ahocorasick is None or not any(rule_keywords):
+        def match(message_lower: str) -> set:
+            return {
+                index for index, keywords in enumerate(rule_keywords)
+                if any(keyword in message_lower for keyword in keywords)
+            }
+        return match
+    
+    automaton = ahocorasick.Automaton()
+    for index, keywords in enumerate(rule_keywords):
+        for keyword in keywords:
+            if keyword in automaton:
+                automaton.get(keyword).add(index)
+            else:
+                automaton.add_word(keyword, {index})
+    automaton.make_automaton()
+    
+    def match(message_lower: str) -> set:
+        hits = set()
+        for _, indexes in automaton.iter(message_lower):
+            hits.update(indexes)
+        return hits
+    return match
+
+@functools.lru_cache()
+def get_shared_notion_tools() -> NotionTools:
+    """Get the process-wide NotionTools instance so its HTTP pool is reused."""
+    return NotionTools()
+
+@functools.lru_cache()
+def get_shared_slack_tools() -> SlackTools:
+    """Get the process-wide SlackTools instance."""
+    return SlackTools()
+
 class WorkflowTools(Tool):
     """Advanced workflow automation tools."""
 
-    def __init__(self):
+    def __init__(self,
+                 notion_tools: Optional[NotionTools] = None,
+                 slack_tools: Optional[SlackTools] = None):
         super().__init__()
-        self.notion_tools = NotionTools()
-        self.slack_tools = SlackTools()
+        settings = get_settings()
+        self.notion_tools = notion_tools or get_shared_notion_tools()
+        self.slack_tools = slack_tools or get_shared_slack_tools()
+        # Bound concurrent Slack sends to stay within Slack's rate limits
+        self._send_sem = asyncio.Semaphore(settings.workflow_max_concurrency)
+        # (database_id, lookback_hours) -> (built_at, {"text": ..., "entries_included": ...});
+        # the newest digest built, kept past the TTL as the stale fallback
+        self._digest_ttl = settings.digest_cache_ttl
+        self._digest_cache: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+        # page_id -> (fetched_at, {"title": ..., "url": ...})
+        self._page_meta_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
 
     async def sync_notion_to_slack(self, 
                                   database_id: str, 
@@ -30,48 +159,72 @@ class WorkflowTools(Tool):
         """Sync Notion database entries to Slack channel."""
         try:
             with PerformanceMonitor("notion_to_slack_sync"):
-                # Query Notion database
-                entries = self.notion_tools.query_database(
-                    database_id=database_id,
-                    filter_conditions=filter_conditions
-                )
-                
-                if not entries or entries[0].get("error"):
-                    return {
-                        "success": False,
-                        "error": "Failed to query Notion database",
-                        "entries_processed": 0
-                    }
-                
-                # Process each entry
-                processed_count = 0
-                errors = []
-                
-                for entry in entries:
+                async def _send_entry(entry: Dict) -> Optional[str]:
+                    """Send one entry to Slack, returning an error string on failure."""
                     try:
                         # Format entry for Slack
                         slack_message = self._format_notion_entry_for_slack(entry, template)
                         
                         # Send to Slack
-                        result = await self.slack_tools.send_message(
-                            channel=channel_id,
-                            text=slack_message["text"],
-                            blocks=slack_message.get("blocks")
-                        )
+                        async with self._send_sem:
+                            result = await self._send_slack_message(
+                                channel=channel_id,
+                                text=slack_message["text"],
+                                blocks=slack_message.get("blocks")
+                            )
                         
                         if result.get("success"):
-                            processed_count += 1
-                        else:
-                            errors.append(f"Failed to send entry {entry.get('id', 'unknown')}")
+                            return None
+                        return f"Failed to send entry {entry.get('id', 'unknown')}"
                             
                     except Exception as e:
-                        errors.append(f"Error processing entry {entry.get('id', 'unknown')}: {e}")
+                        return f"Error processing entry {entry.get('id', 'unknown')}: {e}"
+                
+                # Pipeline Notion pagination with Slack dispatch: the next batch
+                # is fetched while the current one is being sent
+                batches: asyncio.Queue = asyncio.Queue(maxsize=2)
+                
+                async def _produce() -> None:
+                    try:
+                        async for batch in self._iter_pages(database_id, filter_conditions):
+                            await batches.put(batch)
+                    except Exception:
+                        await batches.put(None)
+                        raise
+                    await batches.put(None)
+                
+                producer = asyncio.create_task(_produce())
+                try:
+                    total_entries = 0
+                    # Fetch errors end pagination; send errors only cost their entry
+                    fetch_errors = []
+                    send_errors = []
+                    
+                    while (batch := await batches.get()) is not None:
+                        if batch and batch[0].get("error"):
+                            fetch_errors.append(f"Failed to query Notion database: {batch[0]['error']}")
+                            break
+                        
+                        total_entries += len(batch)
+                        results = await asyncio.gather(*(_send_entry(entry) for entry in batch))
+                        send_errors.extend(error for error in results if error is not None)
+                    
+                    await producer
+                finally:
+                    producer.cancel()
+                
+                if total_entries == 0:
+                    return {
+                        "success": False,
+                        "error": "Failed to query Notion database",
+                        "entries_processed": 0
+                    }
                 
                 return {
                     "success": True,
-                    "entries_processed": processed_count,
-                    "total_entries": len(entries),
-                    "errors": errors
+                    "entries_processed": total_entries - len(send_errors),
+                    "total_entries": total_entries,
+                    "errors": fetch_errors + send_errors
                 }
                 
         except Exception as e:
@@ -95,11 +248,11 @@ class WorkflowTools(Tool):
                 task_details = self._parse_task_from_message(message)
                 
                 # Get user info for assignment
-                user_info = await self.slack_tools.get_user_info(user_id)
+                user_info = await self._cached_get_user_info(user_id)
                 
                 # Prepare Notion properties
-                properties = default_properties or {}
-                properties.update({
+                properties = {
+                    **(default_properties or {}),
                     "Status": {
                         "select": {"name": "Not Started"}
                     },
@@ -108,17 +261,17 @@ class WorkflowTools(Tool):
                     },
                     "Created From": {
                         "rich_text": [{"text": {"content": f"Slack message in <#{channel_id}>"}}]
-                    },
-                    "Due Date": {
-                        "date": {"start": task_details.get("due_date")} if task_details.get("due_date") else None
                     }
-                })
+                }
                 
-                # Remove None values
-                properties = {k: v for k, v in properties.items() if v is not None}
+                # Only send a due date when one was parsed; Notion rejects a null date
+                due_date = task_details.get("due_date")
+                if due_date:
+                    properties["Due Date"] = {"date": {"start": due_date}}
                 
                 # Create page in Notion
-                result = self.notion_tools.create_page(
+                result = await self._call_notion(
+                    self.notion_tools.create_page,
                     parent_database_id=database_id,
                     title=task_details["title"],
                     properties=properties
@@ -126,7 +279,7 @@ class WorkflowTools(Tool):
                 
                 if result.get("success"):
                     # Send confirmation to Slack
-                    await self.slack_tools.send_message(
+                    await self._send_slack_message(
                         channel=channel_id,
                         text=f"✅ Task created: {task_details['title']}\n📄 <{result['url']}|View in Notion>"
                     )
@@ -140,51 +293,113 @@ class WorkflowTools(Tool):
                 "error": str(e)
             }
 
+    async def create_pages_bulk(self,
+                                database_id: str,
+                                entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several pages in a Notion database concurrently.
+        
+        Each entry has a "title" and optional "properties". Creates run
+        under the shared Notion limiter; there is one result per entry,
+        in entry order, and a failed entry does not affect the others.
+        """
+        async def _create(entry: Dict[str, Any]) -> Dict[str, Any]:
+            return await self._call_notion(
+                self.notion_tools.create_page,
+                parent_database_id=database_id,
+                title=entry["title"],
+                properties=entry.get("properties") or {}
+            )
+        
+        with PerformanceMonitor("notion_bulk_create"):
+            results = await asyncio.gather(
+                *(_create(entry) for entry in entries),
+                return_exceptions=True
+            )
+        
+        created = []
+        for entry, result in zip(entries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error creating page {entry.get('title', 'untitled')!r} in bulk: {result}")
+                result = {
+                    "success": False,
+                    "error": str(result)
+                }
+            created.append(result)
+        return created
+
     async def daily_digest(self,
                           database_id: str,
                           channel_id: str,
                           lookback_hours: int = 24) -> Dict[str, Any]:
         """Generate and send a daily digest of Notion updates to Slack."""
+        cache_key = (database_id, lookback_hours)
+        cached = self._digest_cache.get(cache_key)
+        
         try:
             with PerformanceMonitor("daily_digest"):
-                # Calculate time filter
-                cutoff_time = datetime.now() - timedelta(hours=lookback_hours)
+                now = time.monotonic()
+                # Set to "cached" or "stale" when the digest was not freshly built
+                reused = None
                 
-                # Query recent updates
-                filter_conditions = {
-                    "property": "Last edited time",
-                    "date": {
-                        "after": cutoff_time.isoformat()
+                if cached and now - cached[0] < self._digest_ttl:
+                    # Repeated triggers within the TTL window reuse the digest text
+                    digest = cached[1]
+                    reused = "cached"
+                else:
+                    # Calculate time filter
+                    cutoff_time = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
+                    
+                    # Query recent updates
+                    filter_conditions = {
+                        "property": "Last edited time",
+                        "date": {
+                            "after": cutoff_time.isoformat()
+                        }
                     }
-                }
-                
-                entries = self.notion_tools.query_database(
-                    database_id=database_id,
-                    filter_conditions=filter_conditions,
-                    sorts=[
-                        {
-                            "property": "Last edited time",
-                            "direction": "descending"
+                    
+                    entries = await self._call_notion(
+                        self.notion_tools.query_database,
+                        database_id=database_id,
+                        filter_conditions=filter_conditions,
+                        sorts=[
+                            {
+                                "property": "Last edited time",
+                                "direction": "descending"
+                            }
+                        ]
+                    )
+                    
+                    if entries and not entries[0].get("error"):
+                        digest = {
+                            "text": self._format_daily_digest(entries, lookback_hours),
+                            "entries_included": len(entries)
+                        }
+                        # Stored before sending, so a failed send still leaves a last-good digest
+                        _cache_put(self._digest_cache, cache_key, (now, digest), DIGEST_CACHE_MAX_ENTRIES)
+                    elif entries and cached:
+                        # Notion query failed; fall back to the last digest we built
+                        digest = cached[1]
+                        reused = "stale"
+                    else:
+                        digest = {
+                            "text": f"📊 Daily Digest\nNo updates in the last {lookback_hours} hours.",
+                            "entries_included": 0
                         }
-                    ]
-                )
-                
-                if not entries or entries[0].get("error"):
-                    digest_text = f"📊 Daily Digest\nNo updates in the last {lookback_hours} hours."
-                else:
-                    digest_text = self._format_daily_digest(entries, lookback_hours)
                 
                 # Send digest to Slack
-                result = await self.slack_tools.send_message(
+                result = await self._send_slack_message(
                     channel=channel_id,
-                    text=digest_text
+                    text=digest["text"]
                 )
                 
-                return {
+                response = {
                     "success": result.get("success", False),
-                    "entries_included": len(entries) if entries else 0,
+                    "entries_included": digest["entries_included"],
                     "message_ts": result.get("ts")
                 }
+                if reused:
+                    response[reused] = True
+                return response
                 
         except Exception as e:
             logger.error(f"Error generating daily digest: {e}")
@@ -201,36 +416,38 @@ class WorkflowTools(Tool):
         """Update status in Notion and notify team in Slack."""
         try:
             with PerformanceMonitor("status_update_workflow"):
-                # Get current page info
-                page_info = self.notion_tools.get_page(page_id)
-                if not page_info.get("success"):
-                    return {
-                        "success": False,
-                        "error": "Failed to get page info"
-                    }
-                
-                # Update status in Notion
-                update_result = self.notion_tools.update_page(
-                    page_id=page_id,
-                    properties={
-                        "Status": {
-                            "select": {"name": new_status}
+                # Fetch page metadata and update status concurrently; the update
+                # does not depend on the fetched page body
+                page_meta, update_result = await asyncio.gather(
+                    self._get_page_meta(page_id),
+                    self._call_notion(
+                        self.notion_tools.update_page,
+                        page_id=page_id,
+                        properties={
+                            "Status": {
+                                "select": {"name": new_status}
+                            }
                         }
-                    }
+                    )
                 )
                 
                 if not update_result.get("success"):
                     return update_result
                 
-                # Extract page details
-                page = page_info["page"]
-                title = self._extract_page_title(page)
+                if page_meta is None:
+                    return {
+                        "success": False,
+                        "notion_updated": True,
+                        "error": "Failed to get page info"
+                    }
+                
+                title = page_meta["title"]
                 
                 # Send notification to Slack
                 status_emoji = self._get_status_emoji(new_status)
-                notification_text = f"{status_emoji} *{title}*\nStatus updated to: *{new_status}*\n📄 <{page.get('url', '')}|View in Notion>"
+                notification_text = f"{status_emoji} *{title}*\nStatus updated to: *{new_status}*\n📄 <{page_meta['url']}|View in Notion>"
                 
-                slack_result = await self.slack_tools.send_message(
+                slack_result = await self._send_slack_message(
                     channel=channel_id,
                     text=notification_text
                 )
@@ -256,21 +473,39 @@ class WorkflowTools(Tool):
         """Route messages to appropriate channels based on content analysis."""
         try:
             with PerformanceMonitor("smart_channel_routing"):
-                routed_channels = []
+                prepared_rules = self._prepare_rules(routing_rules)
                 
-                for rule in routing_rules:
-                    if self._message_matches_rule(message, rule):
-                        target_channel = rule["target_channel"]
-                        custom_message = rule.get("template", message)
-                        
-                        # Send to target channel
-                        result = await self.slack_tools.send_message(
+                async def _route(target_channel: str, custom_messages: List[str]) -> Optional[str]:
+                    """Send the merged messages to one target channel."""
+                    custom_message = "\n".join(custom_messages)
+                    
+                    # Send to target channel
+                    async with self._send_sem:
+                        result = await self._send_slack_message(
                             channel=target_channel,
                             text=f"🔄 Routed from <#{source_channel}>:\n{custom_message}"
                         )
-                        
-                        if result.get("success"):
-                            routed_channels.append(target_channel)
+                    
+                    return target_channel if result.get("success") else None
+                
+                # Find every rule whose keywords occur in one pass over the message
+                keyword_hits = _build_keyword_matcher(
+                    tuple(rule["_kw_lower"] for rule in prepared_rules)
+                )(message.lower())
+                
+                # Group matching rules by channel so each channel gets one message
+                by_channel: Dict[str, List[str]] = defaultdict(list)
+                for index, rule in enumerate(prepared_rules):
+                    if index in keyword_hits or self._pattern_matches_rule(message, rule):
+                        custom_message = rule.get("template", message)
+                        channel_messages = by_channel[rule["target_channel"]]
+                        if custom_message not in channel_messages:
+                            channel_messages.append(custom_message)
+                
+                results = await asyncio.gather(*(
+                    _route(channel, messages) for channel, messages in by_channel.items()
+                ))
+                routed_channels = [channel for channel in results if channel is not None]
                 
                 return {
                     "success": True,
@@ -285,7 +520,83 @@ class WorkflowTools(Tool):
                 "error": str(e)
             }
 
+    async def aclose(self) -> None:
+        """Release this instance.
+        
+        The Notion client is shared process-wide, so it is left open here;
+        the app closes it once at shutdown with close_notion_clients().
+        """
+
     # Helper methods
+    async def _call_notion(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking NotionTools method in a worker thread, paced by the Notion limiter."""
+        async with _NOTION_LIMITER:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def _send_slack_message(self, **kwargs) -> Dict[str, Any]:
+        """Send a Slack message, paced by the Slack limiter."""
+        async with _SLACK_LIMITER:
+            return await self.slack_tools.send_message(**kwargs)
+
+    async def _get_page_meta(self, page_id: str) -> Optional[Dict[str, str]]:
+        """Get a page's title and URL, reusing recent lookups within the cache TTL."""
+        now = time.monotonic()
+        cached = self._page_meta_cache.get(page_id)
+        if cached and now - cached[0] < PAGE_META_CACHE_TTL:
+            return cached[1]
+        
+        page_info = await self._call_notion(self.notion_tools.get_page, page_id)
+        if not page_info.get("success"):
+            return None
+        
+        # Only cache slowly-changing fields; status comes from the workflow itself
+        page = page_info["page"]
+        page_meta = {
+            "title": self._extract_page_title(page),
+            "url": page.get("url", "")
+        }
+        _cache_put(self._page_meta_cache, page_id, (now, page_meta), PAGE_META_CACHE_MAX_ENTRIES)
+        return page_meta
+
+    async def _iter_pages(self,
+                          database_id: str,
+                          filter_conditions: Optional[Dict] = None,
+                          sorts: Optional[List[Dict]] = None,
+                          page_size: int = 50):
+        """Yield batches of database entries following Notion's cursor pagination."""
+        start_cursor = None
+        while True:
+            page = await self._call_notion(
+                self.notion_tools.query_database_page,
+                database_id=database_id,
+                filter_conditions=filter_conditions,
+                sorts=sorts,
+                start_cursor=start_cursor,
+                page_size=page_size
+            )
+            if not page.get("success"):
+                yield [{"error": page.get("error", "unknown error")}]
+                return
+            
+            yield page["results"]
+            
+            if not page["has_more"] or not page["next_cursor"]:
+                return
+            start_cursor = page["next_cursor"]
+
+    async def _cached_get_user_info(self, user_id: str) -> Dict[str, Any]:
+        """Get Slack user info, reusing successful lookups within the cache TTL."""
+        now = time.monotonic()
+        cached = _USER_CACHE.get(user_id)
+        if cached and now - cached[0] < USER_INFO_CACHE_TTL:
+            return cached[1]
+        
+        async with _SLACK_LIMITER:
+            user_info = await self.slack_tools.get_user_info(user_id)
+        if user_info.get("success"):
+            _cache_put(_USER_CACHE, user_id, (now, user_info), USER_INFO_CACHE_MAX_ENTRIES)
+        return user_info
+
     def _format_notion_entry_for_slack(self, entry: Dict, template: Optional[str] = None) -> Dict[str, Any]:
         """Format a Notion entry for Slack display."""
         if template:
@@ -301,29 +612,17 @@ class WorkflowTools(Tool):
         
         return {
             "text": formatted_text,
-            "blocks": [
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": formatted_text
-                    }
-                }
-            ]
+            "blocks": _wrap_blocks(formatted_text)
         }
 
     def _parse_task_from_message(self, message: str) -> Dict[str, Any]:
         """Parse task details from a message."""
         # Simple parsing logic - could be enhanced with NLP
-        lines = message.split('\n')
-        title = lines[0] if lines else message
+        title = message.split('\n', 1)[0]
         
         # Look for due date patterns
-        due_date = None
-        for line in lines:
-            if "due:" in line.lower() or "deadline:" in line.lower():
-                # Extract date - this would need more sophisticated parsing
-                pass
+        match = _DUE_RE.search(message)
+        due_date = _parse_due_date(match.group(1)) if match else None
         
         return {
             "title": title.strip(),
@@ -333,12 +632,12 @@ class WorkflowTools(Tool):
 
     def _format_daily_digest(self, entries: List[Dict], hours: int) -> str:
         """Format entries into a daily digest."""
+        extract_title = self._extract_page_title
         digest_parts = [f"📊 *Daily Digest* - Last {hours} hours\n"]
-        
-        for i, entry in enumerate(entries[:10]):  # Limit to 10 entries
-            title = self._extract_page_title(entry)
-            url = entry.get("url", "")
-            digest_parts.append(f"{i+1}. <{url}|{title}>")
+        digest_parts.extend(
+            f"{i}. <{entry.get('url', '')}|{extract_title(entry)}>"
+            for i, entry in enumerate(entries[:10], 1)  # Limit to 10 entries
+        )
         
         if len(entries) > 10:
             digest_parts.append(f"... and {len(entries) - 10} more updates")
@@ -348,56 +647,73 @@ class WorkflowTools(Tool):
     def _extract_page_title(self, page: Dict) -> str:
         """Extract title from a Notion page."""
         try:
-            properties = page.get("properties", {})
-            if "Name" in properties:
-                title_prop = properties["Name"]
-                if "title" in title_prop and title_prop["title"]:
-                    return title_prop["title"][0]["text"]["content"]
-            elif "Title" in properties:
-                title_prop = properties["Title"]
-                if "title" in title_prop and title_prop["title"]:
-                    return title_prop["title"][0]["text"]["content"]
-            return "Untitled"
+            properties = page["properties"]
+            title_prop = properties["Name"] if "Name" in properties else properties["Title"]
+            return title_prop["title"][0]["text"]["content"]
         except (KeyError, IndexError, TypeError):
             return "Untitled"
 
     def _get_status_emoji(self, status: str) -> str:
         """Get emoji for status."""
-        status_emojis = {
-            "not started": "⚪",
-            "in progress": "🟡",
-            "completed": "✅",
-            "blocked": "🔴",
-            "on hold": "⏸️"
-        }
-        return status_emojis.get(status.lower(), "📝")
+        return _STATUS_EMOJIS.get(status.lower(), "📝")
+
+    def _prepare_rules(self, rules: List[Dict]) -> List[Dict]:
+        """Attach a compiled pattern and lowercased keywords to each routing rule."""
+        prepared = []
+        for rule in rules:
+            if "_compiled_pattern" in rule:
+                # Already prepared by the caller
+                prepared.append(rule)
+                continue
+            
+            pattern = rule.get("pattern", "")
+            prepared.append({
+                **rule,
+                "_compiled_pattern": _compile_rule_pattern(pattern) if pattern else None,
+                "_kw_lower": _normalize_keywords(tuple(rule.get("keywords", [])))
+            })
+        return prepared
 
     def _message_matches_rule(self, message: str, rule: Dict) -> bool:
         """Check if message matches routing rule."""
-        keywords = rule.get("keywords", [])
-        pattern = rule.get("pattern", "")
-        
-        message_lower = message.lower()
+        if "_compiled_pattern" not in rule:
+            rule = self._prepare_rules([rule])[0]
         
         # Check keywords
+        keywords = rule["_kw_lower"]
         if keywords:
-            for keyword in keywords:
-                if keyword.lower() in message_lower:
-                    return True
-        
-        # Check regex pattern (if provided)
-        if pattern:
-            import re
-            return bool(re.search(pattern, message, re.IGNORECASE))
+            message_lower = message.lower()
+            if any(keyword in message_lower for keyword in keywords):
+                return True
         
+        return self._pattern_matches_rule(message, rule)
+
+    def _pattern_matches_rule(self, message: str, rule: Dict) -> bool:
+        """Check a prepared rule's regex pattern (if provided) against the message."""
+        compiled_pattern = rule["_compiled_pattern"]
+        if compiled_pattern is not None:
+            return bool(compiled_pattern.search(message))
         return False
 
 class AutomationScheduler:
     """Schedule and manage automated workflows."""
     
-    def __init__(self):
-        self.scheduled_tasks = {}
-        self.workflow_tools = WorkflowTools()
+    REDIS_KEY = "automation:scheduled_tasks"
+    
+    def __init__(self, workflow_tools: Optional[WorkflowTools] = None, redis_url: Optional[str] = None):
+        self.scheduled_tasks: Dict[str, Dict] = {}
+        self.workflow_tools = workflow_tools or WorkflowTools()
+        # redis.asyncio connects on the first command, not here
+        self.redis_client = aioredis.from_url(redis_url or get_settings().redis_url)
+        
+        # Active task IDs indexed by channel and database for O(1) dispatch lookups
+        self._by_channel: Dict[str, set] = defaultdict(set)
+        self._by_database: Dict[str, set] = defaultdict(set)
+        
+        # Persisted tasks are restored on first use, inside the running event loop;
+        # the lock is created there too, as asyncio.Lock binds a loop on Python 3.9
+        self._loaded = False
+        self._load_lock: Optional[asyncio.Lock] = None
     
     async def schedule_daily_digest(self, 
                                    database_id: str, 
@@ -408,13 +724,13 @@ class AutomationScheduler:
         
         # This would integrate with a task scheduler like Celery
         # For now, just store the configuration
-        self.scheduled_tasks[task_id] = {
+        await self._store_task(task_id, {
             "type": "daily_digest",
             "database_id": database_id,
             "channel_id": channel_id,
             "time": time_str,
             "active": True
-        }
+        })
         
         logger.info(f"Scheduled daily digest: {task_id}")
         return task_id
@@ -426,25 +742,98 @@ class AutomationScheduler:
         """Schedule reminders for stale tasks."""
         task_id = f"reminders_{database_id}_{channel_id}"
         
-        self.scheduled_tasks[task_id] = {
+        await self._store_task(task_id, {
             "type": "status_reminders",
             "database_id": database_id,
             "channel_id": channel_id,
             "reminder_days": reminder_days,
             "active": True
-        }
+        })
         
         logger.info(f"Scheduled status reminders: {task_id}")
         return task_id
     
-    def get_scheduled_tasks(self) -> Dict[str, Dict]:
-        """Get all scheduled tasks."""
-        return self.scheduled_tasks.copy()
+    async def get_scheduled_tasks(self) -> Mapping[str, Dict]:
+        """Get a read-only view of all scheduled tasks."""
+        await self._ensure_loaded()
+        return MappingProxyType(self.scheduled_tasks)
+    
+    async def get_channel_tasks(self, channel_id: str) -> List[Dict]:
+        """Get active scheduled tasks posting to a channel."""
+        await self._ensure_loaded()
+        return [self.scheduled_tasks[task_id] for task_id in self._by_channel.get(channel_id, ())]
     
-    def cancel_task(self, task_id: str) -> bool:
+    async def get_database_tasks(self, database_id: str) -> List[Dict]:
+        """Get active scheduled tasks reading from a database."""
+        await self._ensure_loaded()
+        return [self.scheduled_tasks[task_id] for task_id in self._by_database.get(database_id, ())]
+    
+    async def cancel_task(self, task_id: str) -> bool:
         """Cancel a scheduled task."""
-        if task_id in self.scheduled_tasks:
-            self.scheduled_tasks[task_id]["active"] = False
-            logger.info(f"Cancelled task: {task_id}")
-            return True
-        return False
+        await self._ensure_loaded()
+        task = self.scheduled_tasks.get(task_id)
+        if task is None:
+            return False
+        
+        # Soft delete: keep the record but drop it from the dispatch indexes
+        await self._store_task(task_id, {**task, "active": False})
+        logger.info(f"Cancelled task: {task_id}")
+        return True
+    
+    async def _store_task(self, task_id: str, task: Dict) -> None:
+        """Record a task in memory, the indexes and the durable store."""
+        await self._ensure_loaded()
+        previous = self.scheduled_tasks.get(task_id)
+        if previous is not None:
+            self._unindex_task(task_id, previous)
+        
+        self.scheduled_tasks[task_id] = task
+        if task.get("active"):
+            self._by_channel[task["channel_id"]].add(task_id)
+            self._by_database[task["database_id"]].add(task_id)
+        
+        try:
+            await self.redis_client.hset(self.REDIS_KEY, task_id, json.dumps(task))
+        except redis.RedisError as e:
+            logger.error(f"Redis error persisting scheduled task {task_id}: {e}")
+    
+    def _unindex_task(self, task_id: str, task: Dict) -> None:
+        """Remove a task from the channel and database indexes."""
+        self._by_channel.get(task["channel_id"], set()).discard(task_id)
+        self._by_database.get(task["database_id"], set()).discard(task_id)
+    
+    async def _ensure_loaded(self) -> None:
+        """Restore persisted tasks once, before the first read or write."""
+        if self._loaded:
+            return
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if not self._loaded:
+                self._loaded = await self._load_tasks()
+    
+    async def _load_tasks(self) -> bool:
+        """Restore scheduled tasks from the durable store, returning whether it was read."""
+        try:
+            stored = await self.redis_client.hgetall(self.REDIS_KEY)
+        except redis.RedisError as e:
+            # Schedule in memory for now; the load is retried on the next call
+            logger.error(f"Redis error loading scheduled tasks: {e}")
+            return False
+        
+        for raw_task_id, raw_task in stored.items():
+            task_id = raw_task_id.decode() if isinstance(raw_task_id, bytes) else raw_task_id
+            if task_id in self.scheduled_tasks:
+                # Changed in memory while Redis was unavailable; that copy is newer
+                continue
+            try:
+                task = json.loads(raw_task)
+            except json.JSONDecodeError as e:
+                logger.error(f"Skipping corrupt scheduled task {task_id}: {e}")
+                continue
+            
+            self.scheduled_tasks[task_id] = task
+            if task.get("active"):
+                self._by_channel[task["channel_id"]].add(task_id)
+                self._by_database[task["database_id"]].add(task_id)
+        return True
@@ -0,0 +1,36 @@
+"""
+Compiled regular expressions shared by the utility helpers.
+
+Each pattern is compiled exactly once here; combined patterns are built
+from the ``.pattern`` strings below so the alternatives cannot drift.
+"""
+import re
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Slack entities
+CHANNEL_NAME_RE = re.compile(r'^[a-z0-9_-]+$')
+USER_MENTION_RE = re.compile(r'<@(?P<users>[UW][A-Z0-9]+)>')
+CHANNEL_MENTION_RE = re.compile(r'<#(?P<channels>C[A-Z0-9]+)')
+
+# Free-text entities
+URL_RE = re.compile(r'https?://[^\s<>|"\']+')
+EMAIL_RE = re.compile(r'\b[\w.%+-]+@[\w.-]+\.[A-Za-z]{2,}\b')
+TOKEN_RE = re.compile(r'\b[A-Za-z0-9]{20,}\b')
+PHONE_RE = re.compile(r'\b\d{3}-\d{3}-\d{4}\b')
+
+# One-pass scanner for extract_mentions; group names match its result keys
+MENTIONS_RE = re.compile(
+    USER_MENTION_RE.pattern
+    + '|' + CHANNEL_MENTION_RE.pattern
+    + '|(?P<urls>' + URL_RE.pattern + ')'
+    + '|(?P<emails>' + EMAIL_RE.pattern + ')'
+)
+
+# One-pass scanner for mask_sensitive_data; alternatives keep the old
+# email -> token -> phone precedence
+SENSITIVE_RE = re.compile(
+    '(?P<email>' + EMAIL_RE.pattern + ')'
+    + '|(?P<token>' + TOKEN_RE.pattern + ')'
+    + '|(?P<phone>' + PHONE_RE.pattern + ')'
+)
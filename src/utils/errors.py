@@ -5,15 +5,29 @@ Custom error classes for the Notion-Slack AI Agent.
 class AgentError(Exception):
     """Base exception class for agent-related errors."""
     
+    __slots__ = ("message", "error_code", "details")
+    
     def __init__(self, message: str, error_code: str = None, details: dict = None):
         self.message = message
         self.error_code = error_code
         self.details = details or {}
         super().__init__(self.message)
+    
+    def __reduce__(self):
+        # Slot values are not in __dict__, so pass them explicitly for pickling
+        state = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if hasattr(self, name)
+        }
+        return (type(self), self.args, state)
 
 class NotionError(AgentError):
     """Exception for Notion API related errors."""
     
+    __slots__ = ("notion_error_code",)
+    
     def __init__(self, message: str, notion_error_code: str = None, **kwargs):
         self.notion_error_code = notion_error_code
         super().__init__(message, error_code="NOTION_ERROR", **kwargs)
@@ -21,6 +35,8 @@ class NotionError(AgentError):
 class SlackError(AgentError):
     """Exception for Slack API related errors."""
     
+    __slots__ = ("slack_error_code",)
+    
     def __init__(self, message: str, slack_error_code: str = None, **kwargs):
         self.slack_error_code = slack_error_code
         super().__init__(message, error_code="SLACK_ERROR", **kwargs)
@@ -28,6 +44,8 @@ class SlackError(AgentError):
 class ValidationError(AgentError):
     """Exception for input validation errors."""
     
+    __slots__ = ("field",)
+    
     def __init__(self, message: str, field: str = None, **kwargs):
         self.field = field
         super().__init__(message, error_code="VALIDATION_ERROR", **kwargs)
@@ -35,6 +53,8 @@ class ValidationError(AgentError):
 class AuthenticationError(AgentError):
     """Exception for authentication and authorization errors."""
     
+    __slots__ = ("auth_type",)
+    
     def __init__(self, message: str, auth_type: str = None, **kwargs):
         self.auth_type = auth_type
         super().__init__(message, error_code="AUTH_ERROR", **kwargs)
@@ -42,6 +62,8 @@ class AuthenticationError(AgentError):
 class RateLimitError(AgentError):
     """Exception for rate limiting errors."""
     
+    __slots__ = ("service", "retry_after")
+    
     def __init__(self, message: str, service: str = None, retry_after: int = None, **kwargs):
         self.service = service
         self.retry_after = retry_after
@@ -50,6 +72,8 @@ class RateLimitError(AgentError):
 class WorkflowError(AgentError):
     """Exception for workflow execution errors."""
     
+    __slots__ = ("workflow_step",)
+    
     def __init__(self, message: str, workflow_step: str = None, **kwargs):
         self.workflow_step = workflow_step
         super().__init__(message, error_code="WORKFLOW_ERROR", **kwargs)
@@ -57,6 +81,8 @@ class WorkflowError(AgentError):
 class ConfigurationError(AgentError):
     """Exception for configuration related errors."""
     
+    __slots__ = ("config_key",)
+    
     def __init__(self, message: str, config_key: str = None, **kwargs):
         self.config_key = config_key
         super().__init__(message, error_code="CONFIG_ERROR", **kwargs)
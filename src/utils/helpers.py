@@ -1,16 +1,35 @@
 """
 Helper functions and utilities for the Notion-Slack AI Agent.
 """
-import re
 import time
 import asyncio
 import functools
-from typing import List, Optional, Callable, Any, Dict
+import itertools
+from collections import deque
+from typing import List, Optional, Callable, Any, Dict, Iterable, Iterator
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 import html
 
 from .errors import ValidationError, RateLimitError
+from ._patterns import (
+    CHANNEL_NAME_RE,
+    MENTIONS_RE,
+    SENSITIVE_RE,
+    WHITESPACE_RE,
+)
+
+# Characters stripped from user input by sanitize_input
+_DELETE_TABLE = str.maketrans('', '', '<>"\'')
+
+# Replacement text per SENSITIVE_RE group
+_MASK_MAP = {'email': '[EMAIL]', 'token': '[TOKEN]', 'phone': '[PHONE]'}
+
+# Sentinel distinguishing a missing key from a stored None in safe_get
+_MISSING = object()
+
+# (seconds, label) pairs for relative timestamps, largest unit first
+_RELATIVE_UNITS = ((86400, 'day'), (3600, 'hour'), (60, 'minute'))
 
 def sanitize_input(text: str, max_length: int = 2000, allow_html: bool = False) -> str:
     """
@@ -38,11 +57,8 @@ def sanitize_input(text: str, max_length: int = 2000, allow_html: bool = False)
     if not allow_html:
         text = html.escape(text)
     
-    # Remove potentially dangerous characters
-    text = re.sub(r'[<>"\']', '', text)
-    
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    # Remove potentially dangerous characters and normalize whitespace
+    text = WHITESPACE_RE.sub(' ', text.translate(_DELETE_TABLE)).strip()
     
     return text
 
@@ -59,11 +75,22 @@ def validate_notion_id(notion_id: str) -> bool:
     if not isinstance(notion_id, str):
         return False
     
+    return _validate_notion_id(notion_id)
+
+@functools.lru_cache(maxsize=2048)
+def _validate_notion_id(notion_id: str) -> bool:
     # Remove hyphens for validation
     clean_id = notion_id.replace('-', '')
     
     # Notion IDs are 32 character hex strings
-    return len(clean_id) == 32 and all(c in '0123456789abcdefABCDEF' for c in clean_id)
+    if len(clean_id) != 32:
+        return False
+    
+    # fromhex skips whitespace, so also require all 16 bytes to decode
+    try:
+        return len(bytes.fromhex(clean_id)) == 16
+    except ValueError:
+        return False
 
 def validate_slack_channel(channel: str) -> bool:
     """
@@ -78,6 +105,10 @@ def validate_slack_channel(channel: str) -> bool:
     if not isinstance(channel, str):
         return False
     
+    return _validate_slack_channel(channel)
+
+@functools.lru_cache(maxsize=2048)
+def _validate_slack_channel(channel: str) -> bool:
     # Channel ID format: C + 10 characters
     if channel.startswith('C') and len(channel) == 11:
         return channel[1:].isalnum()
@@ -85,39 +116,41 @@ def validate_slack_channel(channel: str) -> bool:
     # Channel name format: starts with # and contains valid characters
     if channel.startswith('#'):
         name = channel[1:]
-        return len(name) > 0 and re.match(r'^[a-z0-9_-]+$', name)
+        return len(name) > 0 and CHANNEL_NAME_RE.match(name) is not None
     
     # Allow raw channel names without #
-    return len(channel) > 0 and re.match(r'^[a-z0-9_-]+$', channel)
+    return len(channel) > 0 and CHANNEL_NAME_RE.match(channel) is not None
 
-def format_timestamp(timestamp: str, format_type: str = "relative") -> str:
+def format_timestamp(
+    timestamp: str,
+    format_type: str = "relative",
+    now: Optional[datetime] = None
+) -> str:
     """
     Format a timestamp for display.
     
     Args:
         timestamp: ISO timestamp string
         format_type: "relative", "absolute", or "slack"
+        now: Reference time for relative formatting; pass one in when
+            formatting a batch so every entry shares the same clock
     
     Returns:
         Formatted timestamp string
     """
     try:
         dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        now = datetime.now(timezone.utc)
         
         if format_type == "relative":
-            diff = now - dt
+            if now is None:
+                now = datetime.now(timezone.utc)
+            total = int((now - dt).total_seconds())
             
-            if diff.days > 0:
-                return f"{diff.days} day{'s' if diff.days != 1 else ''} ago"
-            elif diff.seconds > 3600:
-                hours = diff.seconds // 3600
-                return f"{hours} hour{'s' if hours != 1 else ''} ago"
-            elif diff.seconds > 60:
-                minutes = diff.seconds // 60
-                return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-            else:
-                return "Just now"
+            for unit_seconds, unit in _RELATIVE_UNITS:
+                if total >= unit_seconds:
+                    count = total // unit_seconds
+                    return f"{count} {unit}{'s' if count != 1 else ''} ago"
+            return "Just now"
         
         elif format_type == "absolute":
             return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
@@ -149,23 +182,11 @@ def extract_mentions(text: str) -> Dict[str, List[str]]:
         "emails": []
     }
     
-    # Extract user mentions: @username or <@U1234567890>
-    user_mentions = re.findall(r'<@([UW][A-Z0-9]+)>', text)
-    mentions["users"].extend(user_mentions)
-    
-    # Extract channel mentions: #channel or <#C1234567890>
-    channel_mentions = re.findall(r'<#([C][A-Z0-9]+)', text)
-    mentions["channels"].extend(channel_mentions)
-    
-    # Extract URLs
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    urls = re.findall(url_pattern, text)
-    mentions["urls"].extend(urls)
-    
-    # Extract email addresses
-    email_pattern = r'\\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Z|a-z]{2,}\\b'
-    emails = re.findall(email_pattern, text)
-    mentions["emails"].extend(emails)
+    # Single scan for <@U...> users, <#C...> channels, URLs and emails;
+    # each named group is keyed by its bucket in mentions
+    for match in MENTIONS_RE.finditer(text):
+        kind = match.lastgroup
+        mentions[kind].append(match.group(kind))
     
     return mentions
 
@@ -180,14 +201,15 @@ def rate_limit(calls_per_minute: int = 60):
         Decorated function
     """
     def decorator(func):
-        calls = []
+        calls = deque(maxlen=calls_per_minute)
+        _now = time.monotonic
         
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            now = time.time()
+        def record_call():
+            now = _now()
             
             # Remove calls older than 1 minute
-            calls[:] = [call_time for call_time in calls if now - call_time < 60]
+            while calls and now - calls[0] >= 60:
+                calls.popleft()
             
             # Check if we've exceeded the rate limit
             if len(calls) >= calls_per_minute:
@@ -200,34 +222,21 @@ def rate_limit(calls_per_minute: int = 60):
             
             # Record this call
             calls.append(now)
+        
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                record_call()
+                return await func(*args, **kwargs)
             
-            return await func(*args, **kwargs)
+            return async_wrapper
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            now = time.time()
-            
-            # Remove calls older than 1 minute
-            calls[:] = [call_time for call_time in calls if now - call_time < 60]
-            
-            # Check if we've exceeded the rate limit
-            if len(calls) >= calls_per_minute:
-                wait_time = 60 - (now - calls[0])
-                raise RateLimitError(
-                    f"Rate limit exceeded. Try again in {wait_time:.1f} seconds",
-                    service=func.__name__,
-                    retry_after=int(wait_time)
-                )
-            
-            # Record this call
-            calls.append(now)
-            
+            record_call()
             return func(*args, **kwargs)
         
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return sync_wrapper
     
     return decorator
 
@@ -244,25 +253,32 @@ def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0, max_delay:
         Decorated function
     """
     def decorator(func):
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            last_exception = None
+        if asyncio.iscoroutinefunction(func):
+            _async_sleep = asyncio.sleep
             
-            for attempt in range(max_retries + 1):
-                try:
-                    return await func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    
-                    if attempt == max_retries:
-                        # Final attempt failed, raise the exception
-                        raise e
-                    
-                    # Calculate delay with exponential backoff
-                    delay = min(base_delay * (2 ** attempt), max_delay)
-                    await asyncio.sleep(delay)
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                last_exception = None
+                
+                for attempt in range(max_retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        last_exception = e
+                        
+                        if attempt == max_retries:
+                            # Final attempt failed, raise the exception
+                            raise e
+                        
+                        # Calculate delay with exponential backoff
+                        delay = min(base_delay * (2 ** attempt), max_delay)
+                        await _async_sleep(delay)
+                
+                raise last_exception
             
-            raise last_exception
+            return async_wrapper
+        
+        _sleep = time.sleep
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
@@ -280,14 +296,11 @@ def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0, max_delay:
                     
                     # Calculate delay with exponential backoff
                     delay = min(base_delay * (2 ** attempt), max_delay)
-                    time.sleep(delay)
+                    _sleep(delay)
             
             raise last_exception
         
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return sync_wrapper
     
     return decorator
 
@@ -301,25 +314,29 @@ def parse_slack_timestamp(ts: str) -> datetime:
     Returns:
         datetime object
     """
+    # Slack timestamps are Unix timestamps with microseconds; reject
+    # malformed strings up front instead of via float()'s ValueError
+    if isinstance(ts, str) and not (ts.isascii() and ts.replace('.', '', 1).isdigit()):
+        return datetime.now(timezone.utc)
+    
     try:
-        # Slack timestamps are Unix timestamps with microseconds
-        timestamp = float(ts)
-        return datetime.fromtimestamp(timestamp, tz=timezone.utc)
-    except (ValueError, TypeError):
+        return datetime.fromtimestamp(float(ts), tz=timezone.utc)
+    except (ValueError, TypeError, OverflowError, OSError):
         return datetime.now(timezone.utc)
 
-def chunk_list(items: List[Any], chunk_size: int) -> List[List[Any]]:
+def chunk_list(items: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
     """
-    Split a list into chunks of specified size.
+    Lazily split an iterable into chunks of specified size.
     
     Args:
-        items: List to chunk
+        items: Iterable to chunk
         chunk_size: Maximum size of each chunk
     
     Returns:
-        List of chunks
+        Iterator over chunks; wrap in list() if random access is needed
     """
-    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    it = iter(items)
+    return iter(lambda: list(itertools.islice(it, chunk_size)), [])
 
 def safe_get(dictionary: Dict, *keys, default=None):
     """
@@ -334,9 +351,10 @@ def safe_get(dictionary: Dict, *keys, default=None):
         Value at key path or default
     """
     for key in keys:
-        if isinstance(dictionary, dict) and key in dictionary:
-            dictionary = dictionary[key]
-        else:
+        if not isinstance(dictionary, dict):
+            return default
+        dictionary = dictionary.get(key, _MISSING)
+        if dictionary is _MISSING:
             return default
     return dictionary
 
@@ -355,7 +373,8 @@ def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     if len(text) <= max_length:
         return text
     
-    truncate_length = max_length - len(suffix)
+    # Clamp so a suffix longer than max_length cannot turn into a negative slice
+    truncate_length = max(max_length - len(suffix), 0)
     return text[:truncate_length] + suffix
 
 def is_valid_url(url: str) -> bool:
@@ -368,6 +387,21 @@ def is_valid_url(url: str) -> bool:
     Returns:
         True if valid URL, False otherwise
     """
+    if isinstance(url, str):
+        return _is_valid_url(url)
+    
+    try:
+        result = urlparse(url)
+        return all([result.scheme, result.netloc])
+    except Exception:
+        return False
+
+@functools.lru_cache(maxsize=2048)
+def _is_valid_url(url: str) -> bool:
+    # Both a scheme and a netloc require "scheme://"
+    if '://' not in url:
+        return False
+    
     try:
         result = urlparse(url)
         return all([result.scheme, result.netloc])
@@ -384,13 +418,8 @@ def mask_sensitive_data(text: str) -> str:
     Returns:
         Text with sensitive data masked
     """
-    # Mask email addresses
-    text = re.sub(r'\\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Z|a-z]{2,}\\b', '[EMAIL]', text)
-    
-    # Mask potential API keys/tokens
-    text = re.sub(r'\\b[a-zA-Z0-9]{20,}\\b', '[TOKEN]', text)
-    
-    # Mask phone numbers
-    text = re.sub(r'\\b\\d{3}-\\d{3}-\\d{4}\\b', '[PHONE]', text)
-    
-    return text
+    # Mask email addresses, potential API keys/tokens and phone numbers
+    return SENSITIVE_RE.sub(_mask_match, text)
+
+def _mask_match(match) -> str:
+    return _MASK_MAP[match.lastgroup]
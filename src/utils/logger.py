@@ -1,19 +1,40 @@
 """
 Logging utilities for the Notion-Slack AI Agent.
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import time
 from typing import Optional
 from pathlib import Path
 import json
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+# LogRecord attributes that are not emitted as extra fields
+_STD_LOGRECORD_ATTRS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'lineno', 'funcName', 'created',
+    'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process', 'message', 'exc_info', 'exc_text',
+    'stack_info',
+})
+
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging."""
     
     def format(self, record):
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": (
+                time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created))
+                + f'.{int(record.msecs):03d}Z'
+            ),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -27,15 +48,33 @@ class JSONFormatter(logging.Formatter):
             log_entry["exception"] = self.formatException(record.exc_info)
         
         # Add extra fields
-        for key, value in record.__dict__.items():
-            if key not in ('name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 
-                          'filename', 'module', 'lineno', 'funcName', 'created', 
-                          'msecs', 'relativeCreated', 'thread', 'threadName', 
-                          'processName', 'process', 'message', 'exc_info', 'exc_text', 
-                          'stack_info'):
-                log_entry[key] = value
+        log_entry.update(
+            {k: v for k, v in record.__dict__.items() if k not in _STD_LOGRECORD_ATTRS}
+        )
         
-        return json.dumps(log_entry)
+        if orjson is not None:
+            return orjson.dumps(log_entry, default=str).decode('utf-8')
+        return json.dumps(log_entry, default=str)
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for an in-process listener; leaves exc_info for the real formatters."""
+    
+    def prepare(self, record):
+        # Merge args now so later mutation of them cannot change the message
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Background listener that owns the real handlers installed by setup_logging
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_queue_listener() -> None:
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+atexit.register(_stop_queue_listener)
 
 def setup_logging(
     level: str = "INFO",
@@ -52,7 +91,8 @@ def setup_logging(
         json_format: Whether to use JSON formatting
         enable_console: Whether to enable console logging
     """
-    # Clear any existing handlers
+    # Flush and clear any existing handlers
+    _stop_queue_listener()
     logging.getLogger().handlers.clear()
     
     # Set root logger level
@@ -93,10 +133,19 @@ def setup_logging(
         
         handlers.append(file_handler)
     
-    # Configure root logger
+    # Configure root logger; handlers run on the listener thread so log
+    # calls only enqueue the record
+    global _queue_listener
     for handler in handlers:
         handler.setLevel(getattr(logging, level.upper()))
-        logging.getLogger().addHandler(handler)
+    
+    if handlers:
+        log_queue = queue.SimpleQueue()
+        _queue_listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _queue_listener.start()
+        logging.getLogger().addHandler(_LocalQueueHandler(log_queue))
     
     # Configure specific loggers
     configure_library_loggers()
@@ -129,25 +178,34 @@ class ContextLogger:
     def __init__(self, logger: logging.Logger, **context):
         self.logger = logger
         self.context = context
+        self._context_items = tuple(context.items())
     
     def _log_with_context(self, level: int, message: str, **kwargs):
         """Log message with injected context."""
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        exc_info = kwargs.pop('exc_info', None)
+        
         # Merge context with kwargs
-        merged_context = {**self.context, **kwargs}
+        merged_context = dict(self._context_items)
+        if kwargs:
+            merged_context.update(kwargs)
         
-        # Create a new log record with extra context
-        record = self.logger.makeRecord(
-            self.logger.name,
+        # stacklevel=3 attributes the record to the caller of debug()/info()/...
+        self.logger.log(
             level,
-            __file__,
-            0,
             message,
-            (),
-            None,
-            **merged_context
+            exc_info=exc_info,
+            extra=merged_context,
+            stacklevel=3
         )
-        
-        self.logger.handle(record)
+    
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+    
+    def log(self, level: int, message: str, **kwargs):
+        self._log_with_context(level, message, **kwargs)
     
     def debug(self, message: str, **kwargs):
         self._log_with_context(logging.DEBUG, message, **kwargs)
@@ -182,6 +240,14 @@ def get_context_logger(name: str, **context) -> ContextLogger:
     logger = get_logger(name)
     return ContextLogger(logger, **context)
 
+def _log_fields(logger, level: int, message: str, exc_info=None, **fields) -> None:
+    """Log structured fields through a ContextLogger or a plain logging.Logger."""
+    if isinstance(logger, ContextLogger):
+        logger.log(level, message, exc_info=exc_info, **fields)
+    else:
+        # logging.Logger only accepts custom fields through extra=
+        logger.log(level, message, exc_info=exc_info, extra=fields)
+
 # Logging decorators
 def log_function_call(logger: Optional[logging.Logger] = None):
     """
@@ -196,24 +262,35 @@ def log_function_call(logger: Optional[logging.Logger] = None):
             logger = get_logger(func.__module__)
         
         def wrapper(*args, **kwargs):
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            
             # Log function entry
-            logger.debug(
-                f"Calling {func.__name__}",
-                function=func.__name__,
-                args=str(args)[:200],  # Truncate for readability
-                kwargs=str(kwargs)[:200]
-            )
+            if debug_enabled:
+                _log_fields(
+                    logger,
+                    logging.DEBUG,
+                    f"Calling {func.__name__}",
+                    function=func.__name__,
+                    # "args" is a reserved LogRecord attribute, so prefix both
+                    call_args=str(args)[:200],  # Truncate for readability
+                    call_kwargs=str(kwargs)[:200]
+                )
             
             try:
                 result = func(*args, **kwargs)
-                logger.debug(
-                    f"Function {func.__name__} completed successfully",
-                    function=func.__name__,
-                    result_type=type(result).__name__
-                )
+                if debug_enabled:
+                    _log_fields(
+                        logger,
+                        logging.DEBUG,
+                        f"Function {func.__name__} completed successfully",
+                        function=func.__name__,
+                        result_type=type(result).__name__
+                    )
                 return result
             except Exception as e:
-                logger.error(
+                _log_fields(
+                    logger,
+                    logging.ERROR,
                     f"Function {func.__name__} failed",
                     function=func.__name__,
                     error=str(e),
@@ -238,28 +315,30 @@ def log_performance(logger: Optional[logging.Logger] = None, threshold_ms: float
         if logger is None:
             logger = get_logger(func.__module__)
         
-        import time
-        
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             try:
                 result = func(*args, **kwargs)
-                duration_ms = (time.time() - start_time) * 1000
+                duration_ms = (time.perf_counter() - start_time) * 1000
                 
-                log_level = logging.WARNING if duration_ms > threshold_ms else logging.DEBUG
-                logger.log(
-                    log_level,
-                    f"Function {func.__name__} took {duration_ms:.2f}ms",
-                    function=func.__name__,
-                    duration_ms=duration_ms,
-                    slow_call=duration_ms > threshold_ms
-                )
+                slow_call = duration_ms > threshold_ms
+                if slow_call or logger.isEnabledFor(logging.DEBUG):
+                    _log_fields(
+                        logger,
+                        logging.WARNING if slow_call else logging.DEBUG,
+                        f"Function {func.__name__} took {duration_ms:.2f}ms",
+                        function=func.__name__,
+                        duration_ms=duration_ms,
+                        slow_call=slow_call
+                    )
                 
                 return result
             except Exception as e:
-                duration_ms = (time.time() - start_time) * 1000
-                logger.error(
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                _log_fields(
+                    logger,
+                    logging.ERROR,
                     f"Function {func.__name__} failed after {duration_ms:.2f}ms",
                     function=func.__name__,
                     duration_ms=duration_ms,
@@ -291,7 +370,7 @@ def log_security_event(event_type: str, details: dict, severity: str = "INFO"):
     }
     
     level = getattr(logging, severity.upper(), logging.INFO)
-    security_logger.log(level, f"Security event: {event_type}", **log_entry)
+    _log_fields(security_logger, level, f"Security event: {event_type}", **log_entry)
 
 def log_api_call(service: str, operation: str, success: bool, duration_ms: float, **details):
     """
@@ -318,7 +397,8 @@ def log_api_call(service: str, operation: str, success: bool, duration_ms: float
     level = logging.INFO if success else logging.ERROR
     status = "succeeded" if success else "failed"
     
-    api_logger.log(
+    _log_fields(
+        api_logger,
         level,
         f"{service.title()} API call {status}: {operation}",
         **log_entry
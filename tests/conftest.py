@@ -1,55 +1,125 @@
 """
 Test configuration and fixtures for the Notion-Slack AI Agent tests.
+
+Fixture scopes:
+    session:  event_loop, db_schema, test_settings, _test_client,
+              _async_client, _fake_redis_server, mock_notion_client_fast
+              and the _*_mock_template fixtures
+    function: db_session (rolled back per test), client, async_client,
+              user_factory and users, mock_* clients (deep copies of the
+              templates; mock_redis is a flushed fakeredis client) and
+              sample_* payloads (deep copies of the _SAMPLE_* dicts)
 """
+import os
+import sys
 import pytest
+import pytest_asyncio
 import asyncio
+import copy
+from types import SimpleNamespace
 from typing import Generator
-from unittest.mock import Mock, patch
-from sqlalchemy import create_engine
+from unittest.mock import Mock, create_autospec, patch
+from sqlalchemy import create_engine, event, insert
 from sqlalchemy.orm import sessionmaker
-from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
 
-from src.main import app
-from src.models.database import Base, get_db
-from src.models.schemas import User, UserPreferences
-from src.config import Settings, get_settings
+# FastAPI and the application modules (app, models, settings) are imported
+# inside the fixtures that need them so collecting pure-function tests
+# stays cheap
 
-# Test database URL (in-memory SQLite)
-TEST_DATABASE_URL = "sqlite:///./test.db"
+# Test database URL (shared in-memory SQLite); each pytest-xdist worker
+# gets its own database name so parallel runs never share state
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+TEST_DATABASE_URL = (
+    f"sqlite+pysqlite:///file:testdb_{_XDIST_WORKER}"
+    "?mode=memory&cache=shared&uri=true"
+)
 
-# Create test engine
+# Create test engine; StaticPool keeps the one connection (and with it the
+# in-memory database) alive for the whole session
 test_engine = create_engine(
     TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
 )
 
+@event.listens_for(test_engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+    dbapi_connection.isolation_level = None
+    
+    # Nothing here needs to survive a crash, so skip syncs and disk temp files
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+@event.listens_for(test_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
 # Test session factory
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    """On CI, drop the plugins that write .pytest_cache at session end."""
+    if not os.environ.get("CI"):
+        return
+    
+    # Registered by pytest's cacheprovider; --lf/--nf are no-ops on fresh CI runners
+    for name in ("lfplugin", "nfplugin"):
+        plugin = config.pluginmanager.get_plugin(name)
+        if plugin is not None:
+            config.pluginmanager.unregister(plugin)
+
 @pytest.fixture(scope="session")
 def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.new_event_loop()
+    """Create an event loop for the test session, using uvloop when installed."""
+    try:
+        import uvloop
+    except ImportError:  # optional: e.g. on Windows
+        loop = asyncio.new_event_loop()
+    else:
+        loop = uvloop.new_event_loop()
     yield loop
     loop.close()
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a test database session."""
-    # Create tables
+@pytest.fixture(scope="session")
+def db_schema():
+    """Create the test database schema once per session."""
+    from src.models.database import Base
+    
     Base.metadata.create_all(bind=test_engine)
+    yield
+    # Closing the only connection discards the in-memory database; no DROPs needed
+    test_engine.dispose()
+
+@pytest.fixture(scope="function")
+def db_session(db_schema):
+    """Create a test database session rolled back after each test."""
+    connection = test_engine.connect()
+    transaction = connection.begin()
     
-    session = TestingSessionLocal()
+    # commit() inside a test only releases a SAVEPOINT; the outer
+    # transaction is rolled back on teardown
+    session = TestingSessionLocal(
+        bind=connection,
+        join_transaction_mode="create_savepoint"
+    )
     try:
         yield session
     finally:
         session.close()
-        # Drop tables after each test
-        Base.metadata.drop_all(bind=test_engine)
+        transaction.rollback()
+        connection.close()
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def test_settings():
-    """Create test settings."""
+    """Create test settings (read-only; shared by the session)."""
+    from src.config import Settings
+    
     return Settings(
         environment="test",
         debug=True,
@@ -63,9 +133,32 @@ def test_settings():
         redis_url="redis://localhost:6379/1"  # Use different DB for tests
     )
 
-@pytest.fixture(scope="function")
-def client(db_session, test_settings):
-    """Create a test client."""
+@pytest.fixture(scope="session")
+def _test_client():
+    """Start the app (and its lifespan) once per session."""
+    from fastapi.testclient import TestClient
+    from src.main import app
+    
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest_asyncio.fixture(scope="session")
+async def _async_client():
+    """Async client that calls the app in-process on the session event loop."""
+    import httpx
+    from src.main import app
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+        yield async_client
+
+@pytest.fixture
+def _dependency_overrides(db_session, test_settings):
+    """Point the app's get_db/get_settings at the test session and settings."""
+    from src.main import app
+    from src.models.database import get_db
+    from src.config import get_settings
+    
     def override_get_db():
         try:
             yield db_session
@@ -78,158 +171,288 @@ def client(db_session, test_settings):
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_settings] = override_get_settings
     
-    with TestClient(app) as test_client:
-        yield test_client
+    yield
     
-    # Clean up
-    app.dependency_overrides.clear()
+    # Clean up only the overrides installed here
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_settings, None)
+
+@pytest.fixture(scope="function")
+def client(_test_client, _dependency_overrides):
+    """Create a test client."""
+    return _test_client
+
+@pytest.fixture(scope="function")
+def async_client(_async_client, _dependency_overrides):
+    """Create an async test client for async tests."""
+    return _async_client
+
+# Column values for the user variants created by user_factory
+TEST_USERS = {
+    "user": {
+        "slack_user_id": "U1234567890",
+        "slack_team_id": "T1234567890",
+        "email": "test@example.com",
+        "display_name": "Test User",
+        "real_name": "Test User",
+        "is_active": True,
+        "is_admin": False
+    },
+    "admin": {
+        "slack_user_id": "U0987654321",
+        "slack_team_id": "T1234567890",
+        "email": "admin@example.com",
+        "display_name": "Admin User",
+        "real_name": "Admin User",
+        "is_active": True,
+        "is_admin": True
+    },
+}
 
 @pytest.fixture
-def test_user(db_session):
+def user_factory(db_session):
+    """Return a builder that creates only the user variants a test asks for."""
+    from src.models.schemas import User
+    
+    def make_user(kind: str = "user", **overrides):
+        user = User(**{**TEST_USERS[kind], **overrides})
+        db_session.add(user)
+        # flush() assigns the primary key without expiring the instance,
+        # so no reload SELECT follows; the test's rollback still discards it
+        db_session.flush()
+        return user
+    
+    return make_user
+
+@pytest.fixture
+def test_user(user_factory):
     """Create a test user."""
-    user = User(
-        slack_user_id="U1234567890",
-        slack_team_id="T1234567890",
-        email="test@example.com",
-        display_name="Test User",
-        real_name="Test User",
-        is_active=True,
-        is_admin=False
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+    return user_factory("user")
 
 @pytest.fixture
-def test_admin_user(db_session):
+def test_admin_user(user_factory):
     """Create a test admin user."""
-    user = User(
-        slack_user_id="U0987654321",
-        slack_team_id="T1234567890",
-        email="admin@example.com",
-        display_name="Admin User",
-        real_name="Admin User",
-        is_active=True,
-        is_admin=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+    return user_factory("admin")
+
+# Mock client trees are built once per session and deep-copied per test,
+# so each test gets fresh call records without rebuilding the tree
+
+@pytest.fixture(scope="session")
+def _notion_mock_template():
+    """Prebuilt Notion client mock."""
+    mock_instance = Mock()
+    
+    # Configure mock responses
+    mock_instance.pages.create.return_value = {
+        "id": "test_page_id",
+        "url": "https://notion.so/test_page",
+        "properties": {}
+    }
+    
+    mock_instance.databases.query.return_value = {
+        "results": [
+            {
+                "id": "test_page_id",
+                "properties": {"Name": {"title": [{"text": {"content": "Test Page"}}]}},
+                "url": "https://notion.so/test_page",
+                "created_time": "2023-01-01T00:00:00.000Z",
+                "last_edited_time": "2023-01-01T00:00:00.000Z"
+            }
+        ]
+    }
+    
+    mock_instance.search.return_value = {
+        "results": [
+            {
+                "id": "page1",
+                "object": "page",
+                "url": "https://notion.so/page1",
+                "properties": {"Name": {"title": [{"text": {"content": "Search Result"}}]}}
+            }
+        ]
+    }
+    
+    return mock_instance
+
+@pytest.fixture(autouse=True)
+def _clear_notion_client_cache():
+    """Drop cached Notion clients and searches so tests don't see each other's."""
+    yield
+    notion_tools = sys.modules.get("src.tools.notion_tools")
+    if notion_tools is not None:
+        notion_tools._notion_client.cache_clear()
+        notion_tools._SEARCH_CACHE.clear()
+        notion_tools._OPEN_CLIENTS.clear()
+
+@pytest.fixture(autouse=True)
+def _reset_workflow_limiters(monkeypatch):
+    """Give each test full shared rate limiters so earlier tests can't slow it down."""
+    workflow_tools = sys.modules.get("src.tools.workflow_tools")
+    if workflow_tools is not None:
+        from src.services.rate_limiter import AsyncTokenBucket
+        
+        monkeypatch.setattr(workflow_tools, "_SLACK_LIMITER", AsyncTokenBucket(50, 60))
+        monkeypatch.setattr(workflow_tools, "_NOTION_LIMITER", AsyncTokenBucket(3, 1))
 
 @pytest.fixture
-def mock_notion_client():
+def mock_notion_client(_notion_mock_template):
     """Mock Notion client."""
-    with patch("src.tools.notion_tools.NotionClient") as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        
-        # Configure mock responses
-        mock_instance.pages.create.return_value = {
-            "id": "test_page_id",
-            "url": "https://notion.so/test_page",
-            "properties": {}
-        }
-        
-        mock_instance.databases.query.return_value = {
-            "results": [
-                {
-                    "id": "test_page_id",
-                    "properties": {"Name": {"title": [{"text": {"content": "Test Page"}}]}},
-                    "url": "https://notion.so/test_page",
-                    "created_time": "2023-01-01T00:00:00.000Z",
-                    "last_edited_time": "2023-01-01T00:00:00.000Z"
-                }
-            ]
-        }
-        
+    mock_instance = copy.deepcopy(_notion_mock_template)
+    with patch("src.tools.notion_tools.NotionClient", return_value=mock_instance):
         yield mock_instance
 
-@pytest.fixture
-def mock_slack_client():
-    """Mock Slack client."""
-    with patch("src.tools.slack_tools.AsyncWebClient") as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        
-        # Configure mock responses
-        mock_instance.chat_postMessage.return_value = {
-            "ok": True,
-            "ts": "1234567890.123456",
-            "channel": "C1234567890"
-        }
-        
-        mock_instance.conversations_info.return_value = {
-            "ok": True,
-            "channel": {
-                "id": "C1234567890",
-                "name": "test-channel",
-                "is_private": False,
-                "num_members": 5,
-                "topic": {"value": "Test channel"},
-                "purpose": {"value": "For testing"}
+def _fast_notion_page(page_id="test-page-id"):
+    return {
+        "id": page_id,
+        "url": "https://notion.so/test-page",
+        "properties": {},
+        "created_time": "2023-01-01T00:00:00.000Z",
+        "last_edited_time": "2023-01-01T00:00:00.000Z"
+    }
+
+@pytest.fixture(scope="session")
+def mock_notion_client_fast():
+    """Stateless Notion client stub for tests that only check results.
+    
+    Plain functions on SimpleNamespace skip Mock's child creation and call
+    recording; tests asserting on calls should use mock_notion_client.
+    """
+    return SimpleNamespace(
+        pages=SimpleNamespace(
+            create=lambda **kw: _fast_notion_page(),
+            retrieve=lambda page_id: _fast_notion_page(page_id),
+            update=lambda **kw: {"id": kw["page_id"]}
+        ),
+        databases=SimpleNamespace(
+            query=lambda **kw: {"results": [_fast_notion_page()]},
+            retrieve=lambda database_id: {
+                "id": database_id,
+                "title": [{"text": {"content": "Test Database"}}],
+                "properties": {"Name": {"title": {}}},
+                "url": "https://notion.so/test-db"
             }
+        ),
+        search=lambda **kw: {"results": [{**_fast_notion_page(), "object": "page"}]},
+        blocks=SimpleNamespace(
+            children=SimpleNamespace(append=lambda **kw: {"results": kw["children"]})
+        )
+    )
+
+@pytest.fixture(scope="session")
+def _slack_mock_template():
+    """Prebuilt Slack client mock, specced against AsyncWebClient.
+    
+    The autospec makes every API method an AsyncMock that checks call
+    signatures, and rejects methods the real client does not have.
+    """
+    from slack_sdk.web.async_client import AsyncWebClient
+    
+    mock_instance = create_autospec(AsyncWebClient, instance=True)
+    
+    # Configure mock responses
+    mock_instance.chat_postMessage.return_value = {
+        "ok": True,
+        "ts": "1234567890.123456",
+        "channel": "C1234567890"
+    }
+    
+    mock_instance.conversations_info.return_value = {
+        "ok": True,
+        "channel": {
+            "id": "C1234567890",
+            "name": "test-channel",
+            "is_private": False,
+            "num_members": 5,
+            "topic": {"value": "Test channel"},
+            "purpose": {"value": "For testing"}
         }
-        
-        yield mock_instance
+    }
+    
+    # Defaults for the remaining awaited calls, so an unconfigured test
+    # gets a Slack-shaped payload rather than a bare MagicMock
+    mock_instance.chat_update.return_value = {
+        "ok": True,
+        "ts": "1234567890.123456",
+        "channel": "C1234567890"
+    }
+    mock_instance.reactions_add.return_value = {"ok": True}
+    mock_instance.conversations_list.return_value = {"ok": True, "channels": []}
+    mock_instance.conversations_members.return_value = {"ok": True, "members": []}
+    mock_instance.conversations_history.return_value = {"ok": True, "messages": []}
+    
+    return mock_instance
 
 @pytest.fixture
-def mock_redis():
-    """Mock Redis client."""
-    with patch("redis.from_url") as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        
-        # Configure mock responses
-        mock_instance.pipeline.return_value = mock_instance
-        mock_instance.execute.return_value = [None, 0, None, None]
-        mock_instance.zcard.return_value = 0
-        mock_instance.zrange.return_value = []
-        
+def mock_slack_client(_slack_mock_template):
+    """Mock Slack client."""
+    mock_instance = copy.deepcopy(_slack_mock_template)
+    with patch("src.tools.slack_tools.AsyncWebClient", return_value=mock_instance):
         yield mock_instance
 
+@pytest.fixture(scope="session")
+def _fake_redis_server():
+    """In-process Redis server state shared by the session (one per xdist worker)."""
+    import fakeredis
+    
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def mock_redis(_fake_redis_server):
+    """Fake Redis client with real command semantics, emptied after each test."""
+    import fakeredis
+    
+    client = fakeredis.FakeRedis(server=_fake_redis_server)
+    with patch("redis.from_url", return_value=client):
+        yield client
+    client.flushall()
+
+# Sample payloads are built once; each test gets its own deep copy, so it
+# can post or modify one without affecting other tests
+_SAMPLE_SLACK_EVENT = {
+    "token": "verification_token",
+    "team_id": "T1234567890",
+    "api_app_id": "A1234567890",
+    "event": {
+        "type": "app_mention",
+        "user": "U1234567890",
+        "text": "<@U0987654321> hello there",
+        "ts": "1234567890.123456",
+        "channel": "C1234567890",
+        "event_ts": "1234567890.123456"
+    },
+    "type": "event_callback",
+    "event_id": "Ev1234567890",
+    "event_time": 1234567890
+}
+
+_SAMPLE_NOTION_WEBHOOK = {
+    "object": "page",
+    "id": "test_page_id",
+    "created_time": "2023-01-01T00:00:00.000Z",
+    "last_edited_time": "2023-01-01T00:00:00.000Z",
+    "properties": {
+        "Name": {
+            "title": [
+                {
+                    "text": {
+                        "content": "Test Page"
+                    }
+                }
+            ]
+        }
+    },
+    "url": "https://notion.so/test_page"
+}
+
 @pytest.fixture
 def sample_slack_event():
     """Sample Slack event payload."""
-    return {
-        "token": "verification_token",
-        "team_id": "T1234567890",
-        "api_app_id": "A1234567890",
-        "event": {
-            "type": "app_mention",
-            "user": "U1234567890",
-            "text": "<@U0987654321> hello there",
-            "ts": "1234567890.123456",
-            "channel": "C1234567890",
-            "event_ts": "1234567890.123456"
-        },
-        "type": "event_callback",
-        "event_id": "Ev1234567890",
-        "event_time": 1234567890
-    }
+    return copy.deepcopy(_SAMPLE_SLACK_EVENT)
 
 @pytest.fixture
 def sample_notion_webhook():
     """Sample Notion webhook payload."""
-    return {
-        "object": "page",
-        "id": "test_page_id",
-        "created_time": "2023-01-01T00:00:00.000Z",
-        "last_edited_time": "2023-01-01T00:00:00.000Z",
-        "properties": {
-            "Name": {
-                "title": [
-                    {
-                        "text": {
-                            "content": "Test Page"
-                        }
-                    }
-                ]
-            }
-        },
-        "url": "https://notion.so/test_page"
-    }
+    return copy.deepcopy(_SAMPLE_NOTION_WEBHOOK)
 
 @pytest.fixture
 def auth_headers(test_settings):
@@ -244,13 +467,18 @@ class MockAgentResponse:
     def __init__(self, content: str = "Test response"):
         self.content = content
 
+@pytest.fixture(scope="session")
+def _agent_mock_template():
+    """Prebuilt Agno agent mock."""
+    mock_instance = Mock()
+    mock_instance.run.return_value = MockAgentResponse()
+    return mock_instance
+
 @pytest.fixture
-def mock_agent():
+def mock_agent(_agent_mock_template):
     """Mock Agno agent."""
-    with patch("agno.agent.Agent") as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        mock_instance.run.return_value = MockAgentResponse()
+    mock_instance = copy.deepcopy(_agent_mock_template)
+    with patch("agno.agent.Agent", return_value=mock_instance):
         yield mock_instance
 
 # Helper functions for tests
@@ -258,10 +486,15 @@ def create_test_database_record(db_session, model_class, **kwargs):
     """Helper to create test database records."""
     record = model_class(**kwargs)
     db_session.add(record)
+    # commit() expires the record, so attributes reload on first access
     db_session.commit()
-    db_session.refresh(record)
     return record
 
+def create_test_database_records(db_session, model_class, rows):
+    """Helper to seed many rows with one bulk INSERT and a single commit."""
+    db_session.execute(insert(model_class), rows)
+    db_session.commit()
+
 def assert_response_success(response, expected_status=200):
     """Assert API response is successful."""
     assert response.status_code == expected_status
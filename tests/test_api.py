@@ -1,12 +1,27 @@
 """
 Tests for API endpoints and authentication.
 """
+import json
+import time
 import pytest
 from unittest.mock import Mock, patch
 from fastapi import status
+from sqlalchemy import event
+from src.models.repositories import UserRepository
 from src.services.auth_service import AuthService
 from src.services.rate_limiter import RateLimiter, RateLimit
 
+# Request bodies are serialized once at import; send them with content=
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_CHAT_HELLO_BODY = json.dumps({"message": "Hello"})
+_CHAT_TASK_BODY = json.dumps({"message": "Create a task"})
+_NOTION_PAGE_BODY = json.dumps({
+    "database_id": "test_database_id",
+    "title": "Test Page",
+    "properties": {}
+})
+_SLACK_MESSAGE_BODY = json.dumps({"channel": "#test", "text": "Test message"})
+
 class TestAPIEndpoints:
     """Test cases for API endpoints."""
     
@@ -30,7 +45,8 @@ class TestAPIEndpoints:
         """Test chat endpoint without authentication."""
         response = client.post(
             "/api/v1/chat",
-            json={"message": "Hello"}
+            content=_CHAT_HELLO_BODY,
+            headers=_JSON_HEADERS
         )
         assert response.status_code == 401
     
@@ -38,8 +54,8 @@ class TestAPIEndpoints:
         """Test successful chat interaction."""
         response = client.post(
             "/api/v1/chat",
-            json={"message": "Create a task"},
-            headers=auth_headers
+            content=_CHAT_TASK_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
         assert response.status_code == 200
         data = response.json()
@@ -50,36 +66,29 @@ class TestAPIEndpoints:
         """Test Notion pages creation endpoint."""
         response = client.post(
             "/api/v1/notion/pages",
-            json={
-                "database_id": "test_database_id",
-                "title": "Test Page",
-                "properties": {}
-            },
-            headers=auth_headers
+            content=_NOTION_PAGE_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is True
     
     @pytest.mark.asyncio
-    async def test_slack_channels_endpoint(self, client, auth_headers, mock_slack_client):
+    async def test_slack_channels_endpoint(self, async_client, auth_headers, mock_slack_client):
         """Test Slack channels listing endpoint."""
-        response = client.get("/api/v1/slack/channels", headers=auth_headers)
+        response = await async_client.get("/api/v1/slack/channels", headers=auth_headers)
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is True
         assert "channels" in data
     
     @pytest.mark.asyncio
-    async def test_slack_messages_endpoint(self, client, auth_headers, mock_slack_client):
+    async def test_slack_messages_endpoint(self, async_client, auth_headers, mock_slack_client):
         """Test Slack message sending endpoint."""
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/slack/messages",
-            json={
-                "channel": "#test",
-                "text": "Test message"
-            },
-            headers=auth_headers
+            content=_SLACK_MESSAGE_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
         assert response.status_code == 200
         data = response.json()
@@ -88,54 +97,58 @@ class TestAPIEndpoints:
 class TestWebhookEndpoints:
     """Test cases for webhook endpoints."""
     
-    def test_notion_webhook_invalid_signature(self, client):
-        """Test Notion webhook with invalid signature."""
-        response = client.post(
-            "/webhook/notion",
-            json={"test": "data"},
-            headers={"Notion-Webhook-Signature": "invalid"}
-        )
-        assert response.status_code == 401
+    @pytest.fixture(scope="class", autouse=True)
+    def slack_signature_ok(self):
+        """Accept any Slack request signature for the tests in this class."""
+        from src.integrations import webhook_handlers
+        
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(webhook_handlers, "verify_slack_webhook", lambda *args: True)
+            yield
     
     def test_slack_webhook_url_verification(self, client):
         """Test Slack webhook URL verification."""
-        with patch("src.integrations.webhook_handlers.verify_slack_webhook", return_value=True):
-            response = client.post(
-                "/webhook/slack/events",
-                json={
-                    "type": "url_verification",
-                    "challenge": "test_challenge"
-                },
-                headers={
-                    "X-Slack-Request-Timestamp": "1234567890",
-                    "X-Slack-Signature": "valid_signature"
-                }
-            )
-            assert response.status_code == 200
-            data = response.json()
-            assert data["challenge"] == "test_challenge"
+        response = client.post(
+            "/webhook/slack/events",
+            json={
+                "type": "url_verification",
+                "challenge": "test_challenge"
+            },
+            headers={
+                "X-Slack-Request-Timestamp": "1234567890",
+                "X-Slack-Signature": "valid_signature"
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["challenge"] == "test_challenge"
     
     def test_slack_command_endpoint(self, client):
         """Test Slack slash command endpoint."""
-        with patch("src.integrations.webhook_handlers.verify_slack_webhook", return_value=True):
-            response = client.post(
-                "/webhook/slack/commands",
-                data={
-                    "token": "verification_token",
-                    "command": "/task",
-                    "text": "Create a new task",
-                    "user_id": "U1234567890",
-                    "channel_id": "C1234567890"
-                }
-            )
-            assert response.status_code == 200
-            data = response.json()
-            assert data["response_type"] == "ephemeral"
+        response = client.post(
+            "/webhook/slack/commands",
+            data={
+                "token": "verification_token",
+                "command": "/task",
+                "text": "Create a new task",
+                "user_id": "U1234567890",
+                "channel_id": "C1234567890"
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["response_type"] == "ephemeral"
+
+@pytest.fixture(scope="module")
+def sample_token():
+    """JWT for {"sub": "1", "is_admin": False}, signed once per module."""
+    # Token creation never touches the database
+    return AuthService(None).create_access_token({"sub": "1", "is_admin": False})
 
 class TestAuthService:
     """Test cases for authentication service."""
     
-    def test_create_access_token(self, db_session, test_settings):
+    def test_create_access_token(self, db_session):
         """Test JWT token creation."""
         auth_service = AuthService(db_session)
         token_data = {"sub": "1", "is_admin": False}
@@ -145,18 +158,16 @@ class TestAuthService:
         assert isinstance(token, str)
         assert len(token) > 0
     
-    def test_verify_token_success(self, db_session, test_settings):
+    def test_verify_token_success(self, db_session, sample_token):
         """Test token verification."""
         auth_service = AuthService(db_session)
-        token_data = {"sub": "1", "is_admin": False}
         
-        token = auth_service.create_access_token(token_data)
-        payload = auth_service.verify_token(token)
+        payload = auth_service.verify_token(sample_token)
         
         assert payload["sub"] == "1"
         assert payload["is_admin"] is False
     
-    def test_verify_token_invalid(self, db_session, test_settings):
+    def test_verify_token_invalid(self, db_session):
         """Test invalid token verification."""
         auth_service = AuthService(db_session)
         
@@ -245,15 +256,34 @@ class TestRateLimiter:
     
     def test_rate_limit_exceeded(self, mock_redis):
         """Test rate limit exceeded scenario."""
-        # Mock Redis to return high count
-        mock_redis.execute.return_value = [None, 1001, None, None]
+        rate_limiter = RateLimiter()
+        custom_limit = RateLimit(requests=2, window_seconds=60)
+        
+        # Use up the window
+        for _ in range(2):
+            rate_limiter.check_rate_limit("test_key", "api", custom_limit)
         
+        allowed, metadata = rate_limiter.check_rate_limit("test_key", "api", custom_limit)
+        
+        assert allowed is False
+        assert metadata["limit"] == 2
+        assert metadata["remaining"] == 0
+    
+    def test_default_rate_limit_exceeded(self, mock_redis):
+        """Test the default api limit against a pre-filled window."""
         rate_limiter = RateLimiter()
+        limit = rate_limiter.default_limits["api"].requests
+        now = time.time()
+        mock_redis.zadd(
+            "rate_limit:api:test_key",
+            {f"seed-{i}": now for i in range(limit)}
+        )
+        
         allowed, metadata = rate_limiter.check_rate_limit("test_key", "api")
         
-        # This test would need more sophisticated Redis mocking
-        # For now, it demonstrates the testing pattern
-        assert "limit" in metadata
+        assert allowed is False
+        assert metadata["current_count"] == limit + 1
+        assert mock_redis.zcard("rate_limit:api:test_key") == limit
     
     def test_custom_rate_limit(self, mock_redis):
         """Test custom rate limit configuration."""
@@ -284,8 +314,6 @@ class TestDatabaseOperations:
     
     def test_user_repository_create(self, db_session):
         """Test user creation through repository."""
-        from src.models.repositories import UserRepository
-        
         repo = UserRepository(db_session)
         user = repo.create(
             slack_user_id="U1234567890",
@@ -299,8 +327,6 @@ class TestDatabaseOperations:
     
     def test_user_repository_get_by_slack_id(self, db_session, test_user):
         """Test finding user by Slack ID."""
-        from src.models.repositories import UserRepository
-        
         repo = UserRepository(db_session)
         found_user = repo.get_by_slack_id(
             test_user.slack_user_id,
@@ -311,35 +337,60 @@ class TestDatabaseOperations:
         assert found_user.id == test_user.id
     
     def test_user_repository_search(self, db_session, test_user):
-        """Test user search functionality."""
-        from src.models.repositories import UserRepository
-        
+        """Test user search issues one SELECT and finds only the seeded user."""
         repo = UserRepository(db_session)
-        users = repo.search_users("Test")
+        statements = []
         
-        assert len(users) >= 1
-        assert any(u.id == test_user.id for u in users)
+        def record_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        connection = db_session.connection()
+        event.listen(connection, "before_cursor_execute", record_statement)
+        try:
+            users = repo.search_users("Test")
+        finally:
+            event.remove(connection, "before_cursor_execute", record_statement)
+        
+        assert [u.id for u in users] == [test_user.id]
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("SELECT")
+        assert "users" in statements[0]
 
 class TestErrorHandling:
     """Test error handling scenarios."""
     
-    def test_invalid_json_request(self, client, auth_headers):
-        """Test API with invalid JSON."""
-        response = client.post(
-            "/api/v1/chat",
-            data="invalid json",
-            headers=auth_headers
-        )
-        assert response.status_code == 422  # Unprocessable Entity
-    
-    def test_missing_required_fields(self, client, auth_headers):
-        """Test API with missing required fields."""
-        response = client.post(
-            "/api/v1/notion/pages",
-            json={"title": "Missing database_id"},
-            headers=auth_headers
-        )
-        assert response.status_code == 422
+    @pytest.mark.parametrize(
+        "url,body,headers,authenticated,expected_status",
+        [
+            # Notion webhook with invalid signature
+            (
+                "/webhook/notion",
+                {"json": {"test": "data"}},
+                {"Notion-Webhook-Signature": "invalid"},
+                False,
+                401
+            ),
+            # Invalid JSON body -> Unprocessable Entity
+            ("/api/v1/chat", {"data": "invalid json"}, {}, True, 422),
+            # Missing required fields
+            (
+                "/api/v1/notion/pages",
+                {"json": {"title": "Missing database_id"}},
+                {},
+                True,
+                422
+            ),
+        ],
+        ids=["notion_webhook_invalid_signature", "invalid_json_request", "missing_required_fields"]
+    )
+    def test_rejected_requests(self, client, auth_headers, url, body, headers,
+                               authenticated, expected_status):
+        """Test requests the API must reject before doing any work."""
+        if authenticated:
+            headers = {**auth_headers, **headers}
+        
+        response = client.post(url, headers=headers, **body)
+        assert response.status_code == expected_status
     
     def test_database_connection_error(self, client):
         """Test behavior when database is unavailable."""
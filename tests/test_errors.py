@@ -0,0 +1,36 @@
+"""
+Tests for the custom error types.
+"""
+import pickle
+import pytest
+from src.utils.errors import NotionError, RateLimitError, WorkflowError
+
+class TestErrorPickling:
+    """Test cases for pickling the slotted error types."""
+    
+    @pytest.mark.parametrize(
+        "error,attributes",
+        [
+            (
+                NotionError("Page missing", notion_error_code="object_not_found", details={"id": "p1"}),
+                {"error_code": "NOTION_ERROR", "notion_error_code": "object_not_found", "details": {"id": "p1"}}
+            ),
+            (
+                RateLimitError("Too many requests", service="slack", retry_after=30),
+                {"error_code": "RATE_LIMIT_ERROR", "service": "slack", "retry_after": 30}
+            ),
+            (
+                WorkflowError("Send failed", workflow_step="send"),
+                {"error_code": "WORKFLOW_ERROR", "workflow_step": "send"}
+            ),
+        ],
+        ids=["notion", "rate_limit", "workflow"]
+    )
+    def test_errors_survive_pickling(self, error, attributes):
+        """Test slotted errors keep their fields across pickling, e.g. to worker processes."""
+        restored = pickle.loads(pickle.dumps(error))
+        
+        assert type(restored) is type(error)
+        assert restored.message == error.message
+        for name, value in attributes.items():
+            assert getattr(restored, name) == value
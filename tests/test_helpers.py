@@ -0,0 +1,206 @@
+"""
+Tests for helper utilities and their shared regex patterns.
+"""
+import itertools
+import pytest
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from src.utils import _patterns
+from src.utils.helpers import (
+    chunk_list,
+    extract_mentions,
+    format_timestamp,
+    mask_sensitive_data,
+    parse_slack_timestamp,
+    truncate_text,
+)
+
+# Fixed clock for relative timestamps
+_NOW = datetime(2024, 1, 2, 12, 0, 0, tzinfo=timezone.utc)
+
+class TestPatterns:
+    """Test cases for the compiled patterns in _patterns."""
+    
+    @pytest.mark.parametrize(
+        "name,expected",
+        [("dev-alerts_1", True), ("general", True), ("Dev", False), ("dev alerts", False), ("", False)],
+        ids=["dash_underscore_digit", "plain", "uppercase", "space", "empty"]
+    )
+    def test_channel_name(self, name, expected):
+        """Test channel names are lowercase letters, digits, dashes and underscores."""
+        assert bool(_patterns.CHANNEL_NAME_RE.match(name)) is expected
+    
+    def test_token_needs_twenty_characters(self):
+        """Test only alphanumeric runs of 20+ characters count as tokens."""
+        assert _patterns.TOKEN_RE.findall("a" * 19 + " " + "b" * 20) == ["b" * 20]
+    
+    def test_phone_needs_dashes(self):
+        """Test phone numbers are matched in NNN-NNN-NNNN form only."""
+        assert _patterns.PHONE_RE.findall("call 555-123-4567 or 5551234567") == ["555-123-4567"]
+    
+    def test_url_stops_at_slack_delimiters(self):
+        """Test URLs end at Slack's | and > link delimiters and at quotes."""
+        text = '<https://a.b/c|label> "http://q.r"'
+        
+        assert _patterns.URL_RE.findall(text) == ["https://a.b/c", "http://q.r"]
+    
+    def test_combined_group_names(self):
+        """Test combined scanners expose the group names their callers key on."""
+        assert list(_patterns.MENTIONS_RE.groupindex) == ["users", "channels", "urls", "emails"]
+        assert list(_patterns.SENSITIVE_RE.groupindex) == ["email", "token", "phone"]
+
+class TestMaskSensitiveData:
+    """Test cases for mask_sensitive_data."""
+    
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            (
+                "Contact ada@example.com or 555-123-4567, key abcdefghijklmnopqrstuvwxyz012345",
+                "Contact [EMAIL] or [PHONE], key [TOKEN]"
+            ),
+            ("user.name+tag@sub.example.co.uk", "[EMAIL]"),
+            ("short token abc123 and date 2024-01-01", "short token abc123 and date 2024-01-01"),
+        ],
+        ids=["all_kinds", "email_wins_over_token", "nothing_sensitive"]
+    )
+    def test_mask(self, text, expected):
+        """Test emails, tokens and phone numbers are replaced by placeholders."""
+        assert mask_sensitive_data(text) == expected
+
+class TestExtractMentions:
+    """Test cases for extract_mentions."""
+    
+    def test_all_kinds(self):
+        """Test users, channels, URLs and emails are collected in order."""
+        text = (
+            "Hey <@U123ABC> and <@W9Z>, see <#C0456DEF|general> at "
+            "https://notion.so/page-1?x=1 or mail ops@example.com"
+        )
+        
+        assert extract_mentions(text) == {
+            "users": ["U123ABC", "W9Z"],
+            "channels": ["C0456DEF"],
+            "urls": ["https://notion.so/page-1?x=1"],
+            "emails": ["ops@example.com"]
+        }
+    
+    def test_slack_link(self):
+        """Test a Slack-formatted link yields the bare URL."""
+        assert extract_mentions("<https://example.com/a|link>")["urls"] == ["https://example.com/a"]
+    
+    def test_no_mentions(self):
+        """Test every bucket is present even when nothing matches."""
+        assert extract_mentions("nothing here") == {
+            "users": [], "channels": [], "urls": [], "emails": []
+        }
+
+class TestFormatTimestamp:
+    """Test cases for format_timestamp."""
+    
+    @pytest.mark.parametrize(
+        "timestamp,expected",
+        [
+            ("2024-01-02T11:59:30Z", "Just now"),
+            ("2024-01-02T11:59:00Z", "1 minute ago"),
+            ("2024-01-02T10:00:00Z", "2 hours ago"),
+            ("2024-01-01T12:00:00Z", "1 day ago"),
+            ("2023-12-30T12:00:00+00:00", "3 days ago"),
+        ],
+        ids=["seconds", "one_minute", "hours", "one_day", "days_with_offset"]
+    )
+    def test_relative(self, timestamp, expected):
+        """Test relative formatting picks the largest whole unit."""
+        assert format_timestamp(timestamp, now=_NOW) == expected
+    
+    @pytest.mark.parametrize(
+        "format_type,expected",
+        [
+            ("absolute", "2024-01-02 03:04:05 UTC"),
+            ("slack", "<!date^1704164645^{date_short_pretty} {time}|2024-01-02T03:04:05+00:00>"),
+            ("unknown", "2024-01-02T03:04:05Z"),
+        ],
+        ids=["absolute", "slack", "unknown_format"]
+    )
+    def test_other_formats(self, format_type, expected):
+        """Test absolute and Slack formats; unknown formats echo the input."""
+        assert format_timestamp("2024-01-02T03:04:05Z", format_type) == expected
+    
+    def test_invalid_timestamp(self):
+        """Test an unparseable timestamp is returned unchanged."""
+        assert format_timestamp("not a date") == "not a date"
+
+class TestParseSlackTimestamp:
+    """Test cases for parse_slack_timestamp."""
+    
+    @pytest.mark.parametrize(
+        "ts,expected",
+        [
+            ("1700000000.123456", datetime(2023, 11, 14, 22, 13, 20, 123456, tzinfo=timezone.utc)),
+            ("1700000000", datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)),
+        ],
+        ids=["with_micros", "whole_seconds"]
+    )
+    def test_valid(self, ts, expected):
+        """Test Slack timestamps parse to aware UTC datetimes."""
+        assert parse_slack_timestamp(ts) == expected
+    
+    @pytest.mark.parametrize(
+        "ts",
+        ["abc", "1.2.3", "", "-5", "١٢٣"],
+        ids=["letters", "two_dots", "empty", "negative", "non_ascii_digits"]
+    )
+    def test_malformed_falls_back_to_now(self, ts):
+        """Test malformed timestamps fall back to the current time."""
+        before = datetime.now(timezone.utc)
+        
+        parsed = parse_slack_timestamp(ts)
+        
+        assert before <= parsed <= datetime.now(timezone.utc)
+
+class TestChunkList:
+    """Test cases for chunk_list."""
+    
+    def test_returns_iterator(self):
+        """Test chunk_list is lazy; callers needing a list must wrap it."""
+        chunks = chunk_list([1, 2, 3], 2)
+        
+        assert isinstance(chunks, Iterator)
+        assert not isinstance(chunks, list)
+    
+    @pytest.mark.parametrize(
+        "items,chunk_size,expected",
+        [
+            ([1, 2, 3, 4, 5], 2, [[1, 2], [3, 4], [5]]),
+            (range(4), 2, [[0, 1], [2, 3]]),
+            ([], 3, []),
+        ],
+        ids=["uneven", "range_input", "empty"]
+    )
+    def test_chunks(self, items, chunk_size, expected):
+        """Test items are split in order into chunks of at most chunk_size."""
+        assert list(chunk_list(items, chunk_size)) == expected
+    
+    def test_unbounded_input(self):
+        """Test chunks can be pulled from an endless iterable."""
+        chunks = chunk_list(itertools.count(), 2)
+        
+        assert next(chunks) == [0, 1]
+        assert next(chunks) == [2, 3]
+
+class TestTruncateText:
+    """Test cases for truncate_text."""
+    
+    @pytest.mark.parametrize(
+        "text,max_length,suffix,expected",
+        [
+            ("hello world", 8, "...", "hello..."),
+            ("hello", 5, "...", "hello"),
+            ("hello world", 8, "…", "hello w…"),
+            ("hello world", 2, "...", "..."),
+        ],
+        ids=["truncated", "fits_exactly", "custom_suffix", "suffix_longer_than_limit"]
+    )
+    def test_truncate(self, text, max_length, suffix, expected):
+        """Test text over max_length is cut so the suffix fits within it."""
+        assert truncate_text(text, max_length, suffix) == expected
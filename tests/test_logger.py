@@ -0,0 +1,157 @@
+"""
+Tests for logging utilities.
+"""
+import logging
+import pytest
+from src.utils.logger import ContextLogger, log_function_call, log_performance
+
+_LOGGER_NAME = "tests.logger"
+
+@pytest.fixture
+def context_logger(caplog):
+    """ContextLogger with a request_id, capturing DEBUG and above."""
+    caplog.set_level(logging.DEBUG, logger=_LOGGER_NAME)
+    return ContextLogger(logging.getLogger(_LOGGER_NAME), request_id="req-1")
+
+class TestContextLogger:
+    """Test cases for ContextLogger."""
+    
+    def test_log_injects_context(self, context_logger, caplog):
+        """Test log() takes an explicit level and merges context with extras."""
+        # Act
+        context_logger.log(logging.WARNING, "Disk almost full", free_mb=12)
+        
+        # Assert
+        record, = caplog.records
+        assert record.levelno == logging.WARNING
+        assert record.getMessage() == "Disk almost full"
+        assert record.request_id == "req-1"
+        assert record.free_mb == 12
+    
+    def test_log_function_call(self, context_logger, caplog):
+        """Test log_function_call works with a ContextLogger."""
+        # Arrange
+        @log_function_call(context_logger)
+        def add(a, b=0):
+            return a + b
+        
+        # Act
+        result = add(1, b=2)
+        
+        # Assert
+        assert result == 3
+        entry, done = caplog.records
+        assert entry.getMessage() == "Calling add"
+        assert entry.call_args == "(1,)"
+        assert entry.call_kwargs == "{'b': 2}"
+        assert entry.request_id == "req-1"
+        assert done.result_type == "int"
+    
+    def test_log_function_call_failure(self, context_logger, caplog):
+        """Test log_function_call logs and re-raises exceptions."""
+        # Arrange
+        @log_function_call(context_logger)
+        def fail():
+            raise ValueError("boom")
+        
+        # Act
+        with pytest.raises(ValueError):
+            fail()
+        
+        # Assert
+        failure = caplog.records[-1]
+        assert failure.levelno == logging.ERROR
+        assert failure.error_type == "ValueError"
+        assert failure.exc_info is not None
+    
+    @pytest.mark.parametrize(
+        "threshold_ms,expected_level,expected_slow",
+        [
+            (0, logging.WARNING, True),
+            (60_000, logging.DEBUG, False),
+        ],
+        ids=["slow_call", "fast_call"]
+    )
+    def test_log_performance(self, context_logger, caplog, threshold_ms, expected_level, expected_slow):
+        """Test log_performance works with a ContextLogger at both levels."""
+        # Arrange
+        @log_performance(context_logger, threshold_ms=threshold_ms)
+        def work():
+            return "done"
+        
+        # Act
+        result = work()
+        
+        # Assert
+        assert result == "done"
+        record, = caplog.records
+        assert record.levelno == expected_level
+        assert record.slow_call is expected_slow
+        assert record.function == "work"
+        assert record.request_id == "req-1"
+
+class TestDecoratorsWithPlainLogger:
+    """Test the logging decorators with the logging.Logger that get_logger returns."""
+    
+    @pytest.fixture
+    def plain_logger(self, caplog):
+        """Plain stdlib logger, capturing DEBUG and above."""
+        caplog.set_level(logging.DEBUG, logger=_LOGGER_NAME)
+        return logging.getLogger(_LOGGER_NAME)
+    
+    def test_log_function_call(self, plain_logger, caplog):
+        """Test call details are attached as record fields."""
+        # Arrange
+        @log_function_call(plain_logger)
+        def add(a, b=0):
+            return a + b
+        
+        # Act
+        result = add(1, b=2)
+        
+        # Assert
+        assert result == 3
+        entry, done = caplog.records
+        assert entry.call_args == "(1,)"
+        assert entry.call_kwargs == "{'b': 2}"
+        assert done.result_type == "int"
+    
+    @pytest.mark.parametrize(
+        "decorator",
+        [log_function_call, log_performance],
+        ids=["log_function_call", "log_performance"]
+    )
+    def test_failure(self, plain_logger, caplog, decorator):
+        """Test failures are logged with their fields and re-raised."""
+        # Arrange
+        @decorator(plain_logger)
+        def fail():
+            raise ValueError("boom")
+        
+        # Act
+        with pytest.raises(ValueError):
+            fail()
+        
+        # Assert
+        failure = caplog.records[-1]
+        assert failure.levelno == logging.ERROR
+        assert failure.function == "fail"
+        assert failure.error == "boom"
+        assert failure.exc_info is not None
+    
+    def test_log_performance(self, plain_logger, caplog):
+        """Test a slow call is logged as a warning with its timing fields."""
+        # Arrange
+        @log_performance(plain_logger, threshold_ms=0)
+        def work():
+            return "done"
+        
+        # Act
+        result = work()
+        
+        # Assert
+        assert result == "done"
+        record, = caplog.records
+        assert record.levelno == logging.WARNING
+        assert record.slow_call is True
+        assert record.duration_ms >= 0
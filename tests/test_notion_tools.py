@@ -3,28 +3,66 @@ Tests for Notion tools functionality.
 """
 import pytest
 from unittest.mock import patch, Mock
-from src.tools.notion_tools import NotionTools
+from src.tools.notion_tools import NotionTools, _notion_client, close_notion_clients
 from src.utils.errors import NotionError
 
+@pytest.fixture(scope="module")
+def mock_notion_client():
+    """Notion client mock shared by this module; see _reset_notion_client."""
+    client = Mock()
+    page = {
+        "id": "test-page-id",
+        "url": "https://notion.so/test-page",
+        "properties": {},
+        "created_time": "2023-01-01T00:00:00.000Z",
+        "last_edited_time": "2023-01-01T00:00:00.000Z"
+    }
+    client.pages.create.return_value = page
+    client.pages.retrieve.return_value = page
+    client.databases.query.return_value = {"results": [page]}
+    client.search.return_value = {"results": [{**page, "object": "page"}]}
+    return client
+
+@pytest.fixture(scope="module")
+def notion_tools(mock_notion_client):
+    """Create one NotionTools instance with the mocked client for the module."""
+    # A client cached by an earlier module would bypass the patch
+    _notion_client.cache_clear()
+    with patch("src.tools.notion_tools.NotionClient", return_value=mock_notion_client):
+        return NotionTools()
+
+@pytest.fixture(scope="module")
+def notion_tools_fast(mock_notion_client_fast):
+    """NotionTools backed by the call-free stub, for result-only tests."""
+    _notion_client.cache_clear()
+    with patch("src.tools.notion_tools.NotionClient", return_value=mock_notion_client_fast):
+        return NotionTools()
+
+@pytest.fixture(autouse=True)
+def _reset_notion_client(mock_notion_client):
+    """Clear recorded calls and side effects so shared-client tests stay isolated."""
+    yield
+    mock_notion_client.reset_mock(side_effect=True)
+
 class TestNotionTools:
     """Test suite for Notion tools."""
     
-    @pytest.fixture
-    def notion_tools(self, mock_notion_client):
-        """Create NotionTools instance with mocked client."""
-        tools = NotionTools()
-        tools.client = mock_notion_client
-        return tools
-    
-    def test_create_page_success(self, notion_tools, mock_notion_client):
+    def test_create_page_success(self, notion_tools_fast, monkeypatch):
         """Test successful page creation."""
         # Arrange
         database_id = "test-database-id"
         title = "Test Page"
         properties = {"Status": {"select": {"name": "In Progress"}}}
+        calls = []
+        
+        def create(**kwargs):
+            calls.append(kwargs)
+            return {"id": "test-page-id", "url": "https://notion.so/test-page"}
+        
+        monkeypatch.setattr(notion_tools_fast.client.pages, "create", create)
         
         # Act
-        result = notion_tools.create_page(database_id, title, properties)
+        result = notion_tools_fast.create_page(database_id, title, properties)
         
         # Assert
         assert result["success"] is True
@@ -33,10 +71,13 @@ class TestNotionTools:
         assert "Created page: Test Page" in result["message"]
         
         # Verify API call
-        mock_notion_client.pages.create.assert_called_once()
-        call_args = mock_notion_client.pages.create.call_args[1]
-        assert call_args["parent"]["database_id"] == database_id
-        assert call_args["properties"]["Name"]["title"][0]["text"]["content"] == title
+        assert calls == [{
+            "parent": {"database_id": database_id},
+            "properties": {
+                "Name": {"title": [{"text": {"content": title}}]},
+                **properties
+            }
+        }]
     
     def test_create_page_failure(self, notion_tools, mock_notion_client):
         """Test page creation failure."""
@@ -51,58 +92,50 @@ class TestNotionTools:
         assert "API Error" in result["error"]
         assert "Failed to create page" in result["message"]
     
-    def test_query_database_success(self, notion_tools, mock_notion_client):
-        """Test successful database query."""
-        # Arrange
-        database_id = "test-database-id"
-        filter_conditions = {"property": "Status", "select": {"equals": "In Progress"}}
-        
-        # Act
-        result = notion_tools.query_database(database_id, filter_conditions)
-        
-        # Assert
-        assert len(result) == 1
-        assert result[0]["id"] == "test-page-id"
-        assert "properties" in result[0]
-        assert "url" in result[0]
-        
-        # Verify API call
-        mock_notion_client.databases.query.assert_called_once_with(
-            database_id=database_id,
-            filter=filter_conditions
-        )
-    
-    def test_query_database_with_sorts(self, notion_tools, mock_notion_client):
-        """Test database query with sorting."""
+    @pytest.mark.parametrize(
+        "kwargs,side_effect,expected_params,expected_error",
+        [
+            (
+                {"filter_conditions": {"property": "Status", "select": {"equals": "In Progress"}}},
+                None,
+                {"filter": {"property": "Status", "select": {"equals": "In Progress"}}},
+                None
+            ),
+            (
+                {"sorts": [{"property": "Created", "direction": "descending"}]},
+                None,
+                {"sorts": [{"property": "Created", "direction": "descending"}]},
+                None
+            ),
+            ({}, Exception("Query failed"), {}, "Query failed"),
+        ],
+        ids=["with_filter", "with_sorts", "failure"]
+    )
+    def test_query_database(self, notion_tools, mock_notion_client, kwargs,
+                            side_effect, expected_params, expected_error):
+        """Test database queries, their request parameters and failures."""
         # Arrange
         database_id = "test-database-id"
-        sorts = [{"property": "Created", "direction": "descending"}]
+        mock_notion_client.databases.query.side_effect = side_effect
         
         # Act
-        result = notion_tools.query_database(database_id, sorts=sorts)
+        result = notion_tools.query_database(database_id, **kwargs)
         
         # Assert
         assert len(result) == 1
+        if expected_error:
+            assert expected_error in result[0]["error"]
+        else:
+            assert result[0]["id"] == "test-page-id"
+            assert "properties" in result[0]
+            assert "url" in result[0]
         
         # Verify API call
         mock_notion_client.databases.query.assert_called_once_with(
             database_id=database_id,
-            sorts=sorts
+            **expected_params
         )
     
-    def test_query_database_failure(self, notion_tools, mock_notion_client):
-        """Test database query failure."""
-        # Arrange
-        mock_notion_client.databases.query.side_effect = Exception("Query failed")
-        
-        # Act
-        result = notion_tools.query_database("db-id")
-        
-        # Assert
-        assert len(result) == 1
-        assert "error" in result[0]
-        assert "Query failed" in result[0]["error"]
-    
     def test_update_page_success(self, notion_tools, mock_notion_client):
         """Test successful page update."""
         # Arrange
@@ -175,6 +208,52 @@ class TestNotionTools:
         }
         mock_notion_client.search.assert_called_once_with(**expected_params)
     
+    def test_search_pages_reuses_recent_results(self, notion_tools, mock_notion_client):
+        """Test repeated searches are served from the TTL cache."""
+        # Act
+        first = notion_tools.search_pages("cached search")
+        second = notion_tools.search_pages("cached search")
+        
+        # Assert
+        assert second == first
+        mock_notion_client.search.assert_called_once_with(query="cached search")
+    
+    def test_search_pages_returns_copies(self, notion_tools, mock_notion_client):
+        """Test mutating a search result does not change later cached results."""
+        # Arrange
+        first = notion_tools.search_pages("cached search")
+        
+        # Act
+        first[0]["title"] = "Changed"
+        first.clear()
+        second = notion_tools.search_pages("cached search")
+        
+        # Assert
+        assert len(second) == 1
+        assert second[0]["title"] != "Changed"
+        assert mock_notion_client.search.call_count == 1
+    
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda tools: tools.create_page("test-database-id", "New Page", {}),
+            lambda tools: tools.update_page("test-page-id", {}),
+        ],
+        ids=["create_page", "update_page"]
+    )
+    def test_page_writes_invalidate_search_cache(self, notion_tools, mock_notion_client, write):
+        """Test searches after a page write go back to the API."""
+        # Arrange
+        mock_notion_client.pages.update.return_value = {"id": "test-page-id"}
+        notion_tools.search_pages("cached search")
+        
+        # Act
+        write(notion_tools)
+        notion_tools.search_pages("cached search")
+        
+        # Assert
+        assert mock_notion_client.search.call_count == 2
+    
     def test_get_database_schema_success(self, notion_tools, mock_notion_client):
         """Test successful database schema retrieval."""
         # Arrange
@@ -226,63 +305,23 @@ class TestNotionTools:
             children=children
         )
     
-    def test_extract_title_from_title_property(self, notion_tools):
-        """Test title extraction from title property."""
-        # Arrange
-        notion_object = {
-            "properties": {
-                "Name": {
-                    "title": [{"text": {"content": "Test Title"}}]
-                }
-            }
-        }
-        
-        # Act
-        title = notion_tools._extract_title(notion_object)
-        
-        # Assert
-        assert title == "Test Title"
-    
-    def test_extract_title_from_title_field(self, notion_tools):
-        """Test title extraction from title field."""
-        # Arrange
-        notion_object = {
-            "title": [{"text": {"content": "Database Title"}}]
-        }
-        
-        # Act
-        title = notion_tools._extract_title(notion_object)
-        
-        # Assert
-        assert title == "Database Title"
-    
-    def test_extract_title_fallback(self, notion_tools):
-        """Test title extraction fallback to 'Untitled'."""
-        # Arrange
-        notion_object = {"properties": {}}
-        
-        # Act
-        title = notion_tools._extract_title(notion_object)
-        
-        # Assert
-        assert title == "Untitled"
-    
-    def test_extract_title_with_malformed_data(self, notion_tools):
-        """Test title extraction with malformed data."""
-        # Arrange
-        notion_object = {
-            "properties": {
-                "Name": {
-                    "title": []  # Empty title array
-                }
-            }
-        }
-        
-        # Act
-        title = notion_tools._extract_title(notion_object)
-        
-        # Assert
-        assert title == "Untitled"
+    @pytest.mark.parametrize(
+        "notion_object,expected",
+        [
+            # Title property
+            ({"properties": {"Name": {"title": [{"text": {"content": "Test Title"}}]}}}, "Test Title"),
+            # Title field (databases)
+            ({"title": [{"text": {"content": "Database Title"}}]}, "Database Title"),
+            # Fallback
+            ({"properties": {}}, "Untitled"),
+            # Malformed data: empty title array
+            ({"properties": {"Name": {"title": []}}}, "Untitled"),
+        ],
+        ids=["title_property", "title_field", "fallback", "malformed_data"]
+    )
+    def test_extract_title(self, notion_object, expected):
+        """Test title extraction from Notion objects."""
+        assert NotionTools._extract_title(notion_object) == expected
 
     @patch('src.tools.notion_tools.get_settings')
     def test_notion_tools_initialization(self, mock_get_settings):
@@ -292,13 +331,37 @@ class TestNotionTools:
         mock_settings.notion_integration_token = "test-token"
         mock_get_settings.return_value = mock_settings
         
+        _notion_client.cache_clear()
+        
         # Act
         with patch('src.tools.notion_tools.NotionClient') as mock_client_class:
             tools = NotionTools()
+            other_tools = NotionTools()
         
         # Assert
         mock_client_class.assert_called_once_with(auth="test-token")
         assert tools.client == mock_client_class.return_value
+        assert other_tools.client is tools.client
+        assert _notion_client.cache_info().misses == 1
+    
+    @patch('src.tools.notion_tools.get_settings')
+    def test_close_notion_clients(self, mock_get_settings):
+        """Test shutdown closes the shared client and later tools get a fresh one."""
+        # Arrange
+        mock_get_settings.return_value.notion_integration_token = "test-token"
+        _notion_client.cache_clear()
+        
+        with patch('src.tools.notion_tools.NotionClient', side_effect=lambda auth: Mock()):
+            tools = NotionTools()
+            
+            # Act
+            close_notion_clients()
+            reopened = NotionTools()
+        
+        # Assert
+        tools.client.close.assert_called_once_with()
+        assert reopened.client is not tools.client
+        reopened.client.close.assert_not_called()
 
 @pytest.mark.integration
 class TestNotionToolsIntegration:
@@ -0,0 +1,37 @@
+"""
+Tests for rate limiting utilities.
+"""
+import asyncio
+import time
+import pytest
+from src.services.rate_limiter import AsyncTokenBucket
+
+class TestAsyncTokenBucket:
+    """Test cases for the outbound request token bucket."""
+    
+    def test_reused_across_event_loops(self):
+        """Test a bucket keeps working when each caller runs its own event loop."""
+        # Arrange: one token refilled every 10ms, so concurrent callers wait on the lock
+        bucket = AsyncTokenBucket(1, 0.01)
+        
+        async def burst():
+            await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+        
+        # Act / Assert: the second loop must not hit a lock bound to the first
+        asyncio.run(burst())
+        asyncio.run(burst())
+    
+    @pytest.mark.asyncio
+    async def test_paces_after_burst(self):
+        """Test calls beyond the burst size wait for a refill."""
+        # Arrange
+        bucket = AsyncTokenBucket(2, 0.1)
+        
+        # Act
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        elapsed = time.monotonic() - started
+        
+        # Assert
+        assert elapsed >= 0.04
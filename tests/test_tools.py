@@ -1,122 +1,201 @@
 """
 Tests for Notion and Slack tools.
 """
+import asyncio
+import contextlib
+import functools
+import json
 import pytest
+from types import MappingProxyType
 from unittest.mock import Mock, patch
+from src.services.rate_limiter import AsyncTokenBucket
 from src.tools.notion_tools import NotionTools
 from src.tools.slack_tools import SlackTools
+from src.tools import workflow_tools
+from src.tools.workflow_tools import (
+    AutomationScheduler, WorkflowTools,
+    _build_keyword_matcher, _normalize_keywords
+)
+
+# Request payloads reach the client API, so they stay plain JSON-serializable
+# dicts and lists like the tools send in production
+_STATUS_IN_PROGRESS = {"Status": {"select": {"name": "In Progress"}}}
+_STATUS_DONE = {"Status": {"select": {"name": "Done"}}}
+_STATUS_TO_DO = {"Status": {"select": {"name": "To Do"}}}
+_STATUS_DONE_FILTER = {"property": "Status", "select": {"equals": "Done"}}
+_HELLO_BLOCKS = [
+    {"type": "section", "text": {"type": "mrkdwn", "text": "Hello"}}
+]
+
+# Mock client responses, built once at import and read-only
+_CHANNEL_LIST_RESPONSE = MappingProxyType({
+    "channels": [
+        {
+            "id": "C1234567890",
+            "name": "general",
+            "is_private": False,
+            "num_members": 10
+        }
+    ]
+})
+_CREATED_CHANNEL_RESPONSE = MappingProxyType({
+    "channel": {
+        "id": "C9876543210",
+        "name": "new-channel",
+        "is_private": False
+    }
+})
+
+def _notion_page(page_id, title):
+    """Notion API page payload with a Name title."""
+    return {
+        "id": page_id,
+        "properties": {"Name": {"title": [{"text": {"content": title}}]}},
+        "url": f"https://notion.so/{page_id}",
+        "created_time": "2023-01-01T00:00:00.000Z",
+        "last_edited_time": "2023-01-01T00:00:00.000Z"
+    }
+
+def _post_failing_on(marker):
+    """chat_postMessage side effect that fails for messages containing marker."""
+    def post(**kwargs):
+        if marker in kwargs["text"]:
+            raise Exception("channel_not_found")
+        return {"ok": True, "ts": "1234567890.123456", "channel": kwargs["channel"]}
+    return post
+
+# Tools are built once per module; each test binds its fresh client mock
+
+@pytest.fixture(scope="module")
+def _notion_tools_instance():
+    with patch("src.tools.notion_tools.NotionClient"):
+        return NotionTools()
+
+@pytest.fixture(scope="module")
+def _slack_tools_instance():
+    with patch("src.tools.slack_tools.AsyncWebClient"):
+        return SlackTools()
+
+@pytest.fixture
+def notion_tools(_notion_tools_instance, mock_notion_client):
+    """Module-wide NotionTools talking to this test's mock client."""
+    _notion_tools_instance.client = mock_notion_client
+    return _notion_tools_instance
+
+@pytest.fixture
+def notion_tools_fast(_notion_tools_instance, mock_notion_client_fast):
+    """Module-wide NotionTools on the call-free stub, for result-only tests."""
+    _notion_tools_instance.client = mock_notion_client_fast
+    return _notion_tools_instance
+
+@pytest.fixture
+def slack_tools(_slack_tools_instance, mock_slack_client):
+    """Module-wide SlackTools talking to this test's mock client."""
+    _slack_tools_instance.client = mock_slack_client
+    return _slack_tools_instance
 
 class TestNotionTools:
     """Test cases for Notion tools."""
     
-    def test_create_page_success(self, mock_notion_client, test_settings):
-        """Test successful page creation."""
+    @pytest.mark.parametrize(
+        "method,args,mock_path,mock_return,expected,expected_call",
+        [
+            (
+                "create_page",
+                ("test_database_id", "Test Page", _STATUS_IN_PROGRESS),
+                "pages.create",
+                None,
+                {"success": True, "page_id": "test_page_id", "url": "https://notion.so/test_page"},
+                {
+                    "parent": {"database_id": "test_database_id"},
+                    "properties": {
+                        "Name": {"title": [{"text": {"content": "Test Page"}}]},
+                        **_STATUS_IN_PROGRESS
+                    }
+                }
+            ),
+            (
+                "query_database",
+                ("test_database_id",),
+                "databases.query",
+                None,
+                {"id": "test_page_id"},
+                {"database_id": "test_database_id"}
+            ),
+            (
+                "query_database",
+                ("test_database_id", _STATUS_DONE_FILTER),
+                "databases.query",
+                None,
+                {"id": "test_page_id"},
+                {
+                    "database_id": "test_database_id",
+                    "filter": _STATUS_DONE_FILTER
+                }
+            ),
+            (
+                "update_page",
+                ("test_page_id", _STATUS_DONE),
+                "pages.update",
+                {"id": "test_page_id"},
+                {"success": True},
+                {"page_id": "test_page_id", "properties": _STATUS_DONE}
+            ),
+            (
+                "search_pages",
+                ("test query",),
+                "search",
+                None,
+                {"id": "page1", "title": "Search Result"},
+                {"query": "test query"}
+            ),
+        ],
+        ids=[
+            "create_page_success",
+            "query_database_success",
+            "query_database_with_filters",
+            "update_page_success",
+            "search_pages"
+        ]
+    )
+    def test_single_call(self, notion_tools, mock_notion_client, method, args,
+                         mock_path, mock_return, expected, expected_call):
+        """Test tool methods that make exactly one Notion API call."""
         # Arrange
-        tools = NotionTools()
-        database_id = "test_database_id"
-        title = "Test Page"
-        properties = {"Status": {"select": {"name": "In Progress"}}}
+        api_method = functools.reduce(getattr, mock_path.split("."), mock_notion_client)
+        if mock_return is not None:
+            api_method.return_value = mock_return
         
         # Act
-        result = tools.create_page(database_id, title, properties)
+        result = getattr(notion_tools, method)(*args)
         
-        # Assert
-        assert result["success"] is True
-        assert result["page_id"] == "test_page_id"
-        assert result["url"] == "https://notion.so/test_page"
-        mock_notion_client.pages.create.assert_called_once()
+        # Assert (list results are checked through their single item)
+        if isinstance(result, list):
+            assert len(result) == 1
+            result = result[0]
+        assert {key: result.get(key) for key in expected} == expected
+        api_method.assert_called_once_with(**expected_call)
     
-    def test_create_page_failure(self, mock_notion_client, test_settings):
+    def test_create_page_failure(self, notion_tools, mock_notion_client):
         """Test page creation failure."""
         # Arrange
-        tools = NotionTools()
         mock_notion_client.pages.create.side_effect = Exception("API Error")
         
         # Act
-        result = tools.create_page("test_db", "Test", {})
+        result = notion_tools.create_page("test_db", "Test", {})
         
         # Assert
         assert result["success"] is False
         assert "error" in result
-    
-    def test_query_database_success(self, mock_notion_client, test_settings):
-        """Test successful database query."""
-        # Arrange
-        tools = NotionTools()
-        database_id = "test_database_id"
-        
-        # Act
-        result = tools.query_database(database_id)
-        
-        # Assert
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert result[0]["id"] == "test_page_id"
-        mock_notion_client.databases.query.assert_called_once()
-    
-    def test_query_database_with_filters(self, mock_notion_client, test_settings):
-        """Test database query with filters."""
-        # Arrange
-        tools = NotionTools()
-        database_id = "test_database_id"
-        filters = {"property": "Status", "select": {"equals": "Done"}}
-        
-        # Act
-        result = tools.query_database(database_id, filters)
-        
-        # Assert
-        mock_notion_client.databases.query.assert_called_with(
-            database_id=database_id,
-            filter=filters
-        )
-    
-    def test_update_page_success(self, mock_notion_client, test_settings):
-        """Test successful page update."""
-        # Arrange
-        tools = NotionTools()
-        mock_notion_client.pages.update.return_value = {"id": "test_page_id"}
-        
-        # Act
-        result = tools.update_page("test_page_id", {"Status": {"select": {"name": "Done"}}})
-        
-        # Assert
-        assert result["success"] is True
-        mock_notion_client.pages.update.assert_called_once()
-    
-    def test_search_pages(self, mock_notion_client, test_settings):
-        """Test page search functionality."""
-        # Arrange
-        tools = NotionTools()
-        mock_notion_client.search.return_value = {
-            "results": [
-                {
-                    "id": "page1",
-                    "object": "page",
-                    "url": "https://notion.so/page1",
-                    "properties": {"Name": {"title": [{"text": {"content": "Search Result"}}]}}
-                }
-            ]
-        }
-        
-        # Act
-        result = tools.search_pages("test query")
-        
-        # Assert
-        assert len(result) == 1
-        assert result[0]["id"] == "page1"
-        mock_notion_client.search.assert_called_once()
 
 class TestSlackTools:
     """Test cases for Slack tools."""
     
     @pytest.mark.asyncio
-    async def test_send_message_success(self, mock_slack_client, test_settings):
+    async def test_send_message_success(self, slack_tools, mock_slack_client):
         """Test successful message sending."""
-        # Arrange
-        tools = SlackTools()
-        
         # Act
-        result = await tools.send_message(
+        result = await slack_tools.send_message(
             channel="C1234567890",
             text="Test message"
         )
@@ -124,119 +203,123 @@ class TestSlackTools:
         # Assert
         assert result["success"] is True
         assert result["ts"] == "1234567890.123456"
-        mock_slack_client.chat_postMessage.assert_called_once()
+        mock_slack_client.chat_postMessage.assert_called_once_with(
+            channel="C1234567890",
+            text="Test message",
+            blocks=None,
+            thread_ts=None,
+            attachments=None
+        )
     
     @pytest.mark.asyncio
-    async def test_send_message_with_blocks(self, mock_slack_client, test_settings):
+    async def test_send_message_with_blocks(self, slack_tools, mock_slack_client):
         """Test sending message with blocks."""
-        # Arrange
-        tools = SlackTools()
-        blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": "Hello"}}]
-        
         # Act
-        result = await tools.send_message(
+        result = await slack_tools.send_message(
             channel="C1234567890",
             text="Test message",
-            blocks=blocks
+            blocks=_HELLO_BLOCKS
         )
         
         # Assert
-        mock_slack_client.chat_postMessage.assert_called_with(
+        mock_slack_client.chat_postMessage.assert_called_once_with(
             channel="C1234567890",
             text="Test message",
-            blocks=blocks,
+            blocks=_HELLO_BLOCKS,
             thread_ts=None,
             attachments=None
         )
+
     
     @pytest.mark.asyncio
-    async def test_get_channel_info_success(self, mock_slack_client, test_settings):
-        """Test getting channel information."""
+    async def test_send_message_with_serialized_blocks(self, slack_tools, mock_slack_client):
+        """Test blocks already serialized to JSON are passed to Slack unchanged."""
         # Arrange
-        tools = SlackTools()
+        serialized = json.dumps(_HELLO_BLOCKS)
         
         # Act
-        result = await tools.get_channel_info("C1234567890")
+        result = await slack_tools.send_message(
+            channel="C1234567890",
+            text="Hello",
+            blocks=serialized
+        )
+        
+        # Assert
+        assert result["success"] is True
+        assert mock_slack_client.chat_postMessage.call_args.kwargs["blocks"] is serialized
+    
+    @pytest.mark.asyncio
+    async def test_get_channel_info_success(self, slack_tools, mock_slack_client):
+        """Test getting channel information."""
+        # Act
+        result = await slack_tools.get_channel_info("C1234567890")
         
         # Assert
         assert result["success"] is True
         assert result["channel"]["id"] == "C1234567890"
         assert result["channel"]["name"] == "test-channel"
-        mock_slack_client.conversations_info.assert_called_once()
+        mock_slack_client.conversations_info.assert_called_once_with(channel="C1234567890")
     
     @pytest.mark.asyncio
-    async def test_list_channels(self, mock_slack_client, test_settings):
+    async def test_list_channels(self, slack_tools, mock_slack_client):
         """Test listing channels."""
         # Arrange
-        tools = SlackTools()
-        mock_slack_client.conversations_list.return_value = {
-            "channels": [
-                {
-                    "id": "C1234567890",
-                    "name": "general",
-                    "is_private": False,
-                    "num_members": 10
-                }
-            ]
-        }
+        mock_slack_client.conversations_list.return_value = _CHANNEL_LIST_RESPONSE
         
         # Act
-        result = await tools.list_channels()
+        result = await slack_tools.list_channels()
         
         # Assert
         assert len(result) == 1
         assert result[0]["id"] == "C1234567890"
-        mock_slack_client.conversations_list.assert_called_once()
+        mock_slack_client.conversations_list.assert_called_once_with(
+            types="public_channel,private_channel",
+            exclude_archived=True,
+            limit=1000
+        )
     
     @pytest.mark.asyncio
-    async def test_add_reaction_success(self, mock_slack_client, test_settings):
+    async def test_add_reaction_success(self, slack_tools, mock_slack_client):
         """Test adding reaction to message."""
-        # Arrange
-        tools = SlackTools()
-        
         # Act
-        result = await tools.add_reaction("C1234567890", "1234567890.123456", "thumbsup")
+        result = await slack_tools.add_reaction("C1234567890", "1234567890.123456", "thumbsup")
         
         # Assert
         assert result["success"] is True
-        mock_slack_client.reactions_add.assert_called_once()
+        mock_slack_client.reactions_add.assert_called_once_with(
+            channel="C1234567890",
+            timestamp="1234567890.123456",
+            name="thumbsup"
+        )
     
     @pytest.mark.asyncio
-    async def test_create_channel_success(self, mock_slack_client, test_settings):
+    async def test_create_channel_success(self, slack_tools, mock_slack_client):
         """Test creating a new channel."""
         # Arrange
-        tools = SlackTools()
-        mock_slack_client.conversations_create.return_value = {
-            "channel": {
-                "id": "C9876543210",
-                "name": "new-channel",
-                "is_private": False
-            }
-        }
+        mock_slack_client.conversations_create.return_value = _CREATED_CHANNEL_RESPONSE
         
         # Act
-        result = await tools.create_channel("new-channel")
+        result = await slack_tools.create_channel("new-channel")
         
         # Assert
         assert result["success"] is True
         assert result["channel"]["id"] == "C9876543210"
-        mock_slack_client.conversations_create.assert_called_once()
+        mock_slack_client.conversations_create.assert_called_once_with(
+            name="new-channel",
+            is_private=False
+        )
 
 class TestToolIntegration:
     """Integration tests for tools working together."""
     
     @pytest.mark.asyncio
-    async def test_notion_to_slack_workflow(self, mock_notion_client, mock_slack_client, test_settings):
+    async def test_notion_to_slack_workflow(self, notion_tools_fast, slack_tools):
         """Test workflow from Notion to Slack."""
-        # Arrange
-        notion_tools = NotionTools()
-        slack_tools = SlackTools()
-        
         # Create page in Notion
-        page_result = notion_tools.create_page(
+        page_result = notion_tools_fast.create_page(
             "test_database_id",
             "New Task",
-            {"Status": {"select": {"name": "To Do"}}}
+            _STATUS_TO_DO
         )
         
         # Send notification to Slack
@@ -249,29 +332,405 @@ class TestToolIntegration:
         assert page_result["success"] is True
         assert slack_result["success"] is True
     
-    def test_search_and_share_workflow(self, mock_notion_client, mock_slack_client, test_settings):
-        """Test searching Notion and sharing results in Slack."""
+    @pytest.mark.asyncio
+    async def test_create_pages_bulk(self, notion_tools, slack_tools, mock_notion_client):
+        """Test creating several Notion pages in one concurrent batch."""
         # Arrange
-        notion_tools = NotionTools()
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        entries = [
+            {"title": "Task 1"},
+            {"title": "Task 2", "properties": _STATUS_TO_DO}
+        ]
         
-        # Mock search results
-        mock_notion_client.search.return_value = {
-            "results": [
-                {
-                    "id": "result1",
-                    "object": "page",
-                    "url": "https://notion.so/result1",
-                    "properties": {"Name": {"title": [{"text": {"content": "Found Page"}}]}}
-                }
-            ]
+        # Act
+        results = await workflow_tools.create_pages_bulk("test_database_id", entries)
+        
+        # Assert
+        assert [result["success"] for result in results] == [True, True]
+        assert mock_notion_client.pages.create.call_count == len(entries)
+    
+    @pytest.mark.asyncio
+    async def test_create_pages_bulk_partial_failure(self, notion_tools, slack_tools, mock_notion_client):
+        """Test a failing entry gets its own error result without dropping the others."""
+        # Arrange
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        entries = [
+            {"title": "Task 1"},
+            {"properties": _STATUS_TO_DO},
+            {"title": "Task 3"}
+        ]
+        
+        # Act
+        results = await workflow_tools.create_pages_bulk("test_database_id", entries)
+        
+        # Assert
+        assert len(results) == len(entries)
+        assert [result["success"] for result in results] == [True, False, True]
+        assert "title" in results[1]["error"]
+        assert mock_notion_client.pages.create.call_count == 2
+
+class TestWorkflowTools:
+    """Behaviour tests for WorkflowTools against the mock clients."""
+    
+    @pytest.mark.asyncio
+    async def test_sync_follows_cursor_across_pages(self, notion_tools, slack_tools,
+                                                   mock_notion_client, mock_slack_client):
+        """Test sync reads every page and counts only successful sends as processed."""
+        # Arrange
+        mock_notion_client.databases.query.side_effect = [
+            {"results": [_notion_page("p1", "Task 1"), _notion_page("p2", "Task 2")],
+             "has_more": True, "next_cursor": "cursor_2"},
+            {"results": [_notion_page("p3", "Task 3")], "has_more": False, "next_cursor": None},
+        ]
+        mock_slack_client.chat_postMessage.side_effect = _post_failing_on("Task 2")
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        
+        # Act
+        result = await workflow_tools.sync_notion_to_slack("test_database_id", "C1234567890")
+        
+        # Assert
+        assert result["success"] is True
+        assert result["total_entries"] == 3
+        assert result["entries_processed"] == 2
+        assert result["errors"] == ["Failed to send entry p2"]
+        cursors = [call.kwargs.get("start_cursor") for call in mock_notion_client.databases.query.call_args_list]
+        assert cursors == [None, "cursor_2"]
+    
+    def test_entry_blocks_are_serialized_section(self, notion_tools, slack_tools):
+        """Test formatted entries carry their text as one pre-serialized section block."""
+        # Arrange
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        
+        # Act
+        message = workflow_tools._format_notion_entry_for_slack(_notion_page("p1", 'Fix "login"\\ bug'))
+        
+        # Assert
+        assert json.loads(message["blocks"]) == [
+            {"type": "section", "text": {"type": "mrkdwn", "text": message["text"]}}
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_sync_fetch_failure_mid_pagination(self, notion_tools, slack_tools,
+                                                     mock_notion_client, mock_slack_client):
+        """Test a failed page fetch is reported without discounting sent entries."""
+        # Arrange
+        mock_notion_client.databases.query.side_effect = [
+            {"results": [_notion_page("p1", "Task 1"), _notion_page("p2", "Task 2")],
+             "has_more": True, "next_cursor": "cursor_2"},
+            Exception("rate_limited"),
+        ]
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        
+        # Act
+        result = await workflow_tools.sync_notion_to_slack("test_database_id", "C1234567890")
+        
+        # Assert
+        assert result["success"] is True
+        assert result["total_entries"] == 2
+        assert result["entries_processed"] == 2
+        assert result["errors"] == ["Failed to query Notion database: rate_limited"]
+        assert mock_slack_client.chat_postMessage.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_query_failure(self, notion_tools, slack_tools, mock_notion_client):
+        """Test a sync whose first page fails reports nothing processed."""
+        # Arrange
+        mock_notion_client.databases.query.side_effect = Exception("unauthorized")
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        
+        # Act
+        result = await workflow_tools.sync_notion_to_slack("test_database_id", "C1234567890")
+        
+        # Assert
+        assert result == {
+            "success": False,
+            "error": "Failed to query Notion database",
+            "entries_processed": 0
+        }
+
+    @pytest.mark.asyncio
+    async def test_aclose_leaves_shared_tools_usable(self, slack_tools, mock_notion_client):
+        """Test closing one WorkflowTools leaves the shared NotionTools working for another."""
+        # Arrange
+        workflow_tools.get_shared_notion_tools.cache_clear()
+        try:
+            first = WorkflowTools(slack_tools=slack_tools)
+            second = WorkflowTools(slack_tools=slack_tools)
+            
+            # Act
+            await first.aclose()
+            results = await second.create_pages_bulk("test-db", [{"title": "Task"}])
+        finally:
+            workflow_tools.get_shared_notion_tools.cache_clear()
+        
+        # Assert
+        assert second.notion_tools is first.notion_tools
+        mock_notion_client.close.assert_not_called()
+        assert results[0]["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_sync_bounds_concurrent_sends(self, notion_tools, slack_tools,
+                                                mock_notion_client, mock_slack_client):
+        """Test sync never has more Slack sends in flight than the semaphore allows."""
+        # Arrange
+        mock_notion_client.databases.query.return_value = {
+            "results": [_notion_page(f"p{i}", f"Task {i}") for i in range(6)],
+            "has_more": False,
+            "next_cursor": None
+        }
+        in_flight = peak = 0
+        
+        async def post(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"ok": True, "ts": "1234567890.123456", "channel": kwargs["channel"]}
+        
+        mock_slack_client.chat_postMessage.side_effect = post
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        workflow_tools._send_sem = asyncio.Semaphore(2)
+        
+        # Act
+        result = await workflow_tools.sync_notion_to_slack("test_database_id", "C1234567890")
+        
+        # Assert
+        assert result["entries_processed"] == 6
+        assert peak == 2
+    
+    @pytest.mark.asyncio
+    async def test_daily_digest_reuses_cached_digest(self, notion_tools, slack_tools,
+                                                     mock_notion_client, mock_slack_client):
+        """Test a repeat digest within the TTL reuses the built text but still posts it."""
+        # Arrange
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        
+        # Act
+        first = await workflow_tools.daily_digest("test_database_id", "C1234567890")
+        second = await workflow_tools.daily_digest("test_database_id", "C1234567890")
+        
+        # Assert
+        assert first["success"] is True
+        assert "cached" not in first
+        assert second == {**first, "cached": True}
+        assert mock_notion_client.databases.query.call_count == 1
+        first_text, second_text = (
+            call.kwargs["text"] for call in mock_slack_client.chat_postMessage.call_args_list
+        )
+        assert second_text == first_text
+    
+    @pytest.mark.asyncio
+    async def test_daily_digest_falls_back_to_last_good(self, notion_tools, slack_tools,
+                                                        mock_notion_client, mock_slack_client):
+        """Test a failed Notion query resends the last built digest marked stale."""
+        # Arrange: the first digest is built but its send fails
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        workflow_tools._digest_ttl = 0
+        mock_slack_client.chat_postMessage.side_effect = [
+            Exception("channel_not_found"),
+            {"ok": True, "ts": "1234567890.123456", "channel": "C1234567890"},
+        ]
+        first = await workflow_tools.daily_digest("test_database_id", "C1234567890")
+        mock_notion_client.databases.query.side_effect = Exception("service_unavailable")
+        
+        # Act
+        second = await workflow_tools.daily_digest("test_database_id", "C1234567890")
+        
+        # Assert
+        assert first["success"] is False
+        assert second["success"] is True
+        assert second["stale"] is True
+        assert second["entries_included"] == first["entries_included"] == 1
+        first_text, second_text = (
+            call.kwargs["text"] for call in mock_slack_client.chat_postMessage.call_args_list
+        )
+        assert second_text == first_text
+    
+    @pytest.mark.asyncio
+    async def test_smart_channel_routing_groups_by_channel(self, notion_tools, slack_tools, mock_slack_client):
+        """Test matching rules for one channel are merged into a single message."""
+        # Arrange
+        workflow_tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        routing_rules = [
+            {"keywords": ["BUG"], "target_channel": "C_DEV", "template": "Bug report"},
+            {"pattern": r"login\s+fail", "target_channel": "C_DEV", "template": "Login issue"},
+            {"keywords": ["invoice"], "target_channel": "C_BILLING"},
+            {"keywords": ["", "  "], "target_channel": "C_NEVER"},
+        ]
+        
+        # Act
+        result = await workflow_tools.smart_channel_routing(
+            "Found a bug: login failed", "C_GENERAL", routing_rules
+        )
+        
+        # Assert
+        assert result == {"success": True, "routed_to": ["C_DEV"], "total_routes": 1}
+        mock_slack_client.chat_postMessage.assert_awaited_once()
+        sent = mock_slack_client.chat_postMessage.call_args.kwargs
+        assert sent["channel"] == "C_DEV"
+        assert sent["text"] == "🔄 Routed from <#C_GENERAL>:\nBug report\nLogin issue"
+    
+    @pytest.mark.asyncio
+    async def test_user_info_is_cached(self, notion_tools, slack_tools, mock_slack_client, monkeypatch):
+        """Test repeated user lookups hit Slack once within the TTL."""
+        # Arrange
+        monkeypatch.setattr(workflow_tools, "_USER_CACHE", {})
+        mock_slack_client.users_info.return_value = {
+            "ok": True,
+            "user": {"id": "U1234567890", "name": "ada", "real_name": "Ada Lovelace"}
         }
+        tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
         
         # Act
-        search_results = notion_tools.search_pages("important project")
+        first = await tools._cached_get_user_info("U1234567890")
+        second = await tools._cached_get_user_info("U1234567890")
         
         # Assert
-        assert len(search_results) == 1
-        assert search_results[0]["title"] == "Found Page"
+        assert second == first
+        assert first["user"]["real_name"] == "Ada Lovelace"
+        mock_slack_client.users_info.assert_awaited_once_with(user="U1234567890")
+    
+    @pytest.mark.parametrize(
+        "message,expected_title,expected_due",
+        [
+            ("Fix login\ndue: 2024-05-01", "Fix login", "2024-05-01"),
+            ("Ship release\nDeadline:  2024-06-30 EOD", "Ship release", "2024-06-30"),
+            ("Fix login\ndue: next week", "Fix login", None),
+            ("Fix login\ndue:\n2024-05-01", "Fix login", None),
+            ("Fix login", "Fix login", None),
+        ],
+        ids=["iso_date", "deadline_with_suffix", "not_a_date", "value_on_next_line", "no_due_date"]
+    )
+    def test_parse_task_due_date(self, notion_tools, slack_tools, message, expected_title, expected_due):
+        """Test due dates are read from a due:/deadline: line in ISO format."""
+        tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        
+        task = tools._parse_task_from_message(message)
         
-        # This would continue with sending results to Slack
-        # but we'll keep the test focused on the search functionality
+        assert task["title"] == expected_title
+        assert task["due_date"] == expected_due
+    
+    @pytest.mark.asyncio
+    async def test_scheduler_round_trip(self, notion_tools, slack_tools):
+        """Test scheduled tasks persist to Redis and are restored by a new scheduler."""
+        # Arrange
+        import fakeredis
+        
+        server = fakeredis.FakeServer()
+        tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        
+        # Act
+        with patch("redis.asyncio.from_url", side_effect=lambda url: fakeredis.FakeAsyncRedis(server=server)):
+            scheduler = AutomationScheduler(workflow_tools=tools)
+            digest_id = await scheduler.schedule_daily_digest("db1", "C1", "08:30")
+            reminders_id = await scheduler.schedule_status_reminders("db1", "C2", reminder_days=5)
+            cancelled = await scheduler.cancel_task(digest_id)
+            cancelled_missing = await scheduler.cancel_task("missing")
+            
+            restored = AutomationScheduler(workflow_tools=tools)
+            tasks = await restored.get_scheduled_tasks()
+            channel_tasks = await restored.get_channel_tasks("C1")
+            database_tasks = await restored.get_database_tasks("db1")
+        
+        # Assert
+        assert (cancelled, cancelled_missing) == (True, False)
+        assert set(tasks) == {digest_id, reminders_id}
+        assert tasks[digest_id]["active"] is False
+        assert tasks[digest_id]["time"] == "08:30"
+        assert tasks[reminders_id]["reminder_days"] == 5
+        assert channel_tasks == []
+        assert database_tasks == [tasks[reminders_id]]
+    
+    @pytest.mark.asyncio
+    async def test_scheduler_retries_failed_load(self, notion_tools, slack_tools):
+        """Test a Redis error while loading is retried instead of marking tasks loaded."""
+        # Arrange
+        import fakeredis
+        import redis
+        
+        server = fakeredis.FakeServer()
+        tools = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        
+        with patch("redis.asyncio.from_url", side_effect=lambda url: fakeredis.FakeAsyncRedis(server=server)):
+            digest_id = await AutomationScheduler(workflow_tools=tools).schedule_daily_digest("db1", "C1")
+            scheduler = AutomationScheduler(workflow_tools=tools)
+            
+            # Act
+            with patch.object(scheduler.redis_client, "hgetall", side_effect=redis.ConnectionError("down")):
+                reminders_id = await scheduler.schedule_status_reminders("db1", "C2")
+            tasks = await scheduler.get_scheduled_tasks()
+        
+        # Assert
+        assert set(tasks) == {digest_id, reminders_id}
+        assert await scheduler.get_channel_tasks("C1") == [tasks[digest_id]]
+    
+    @pytest.mark.asyncio
+    async def test_limiters_are_shared_across_workflows(self, notion_tools, slack_tools,
+                                                        mock_slack_client, monkeypatch):
+        """Test every workflow instance draws from the same module-level Slack bucket."""
+        # Arrange: two tokens that never refill within the test
+        bucket = AsyncTokenBucket(2, 3600)
+        monkeypatch.setattr(workflow_tools, "_SLACK_LIMITER", bucket)
+        first = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        second = WorkflowTools(notion_tools=notion_tools, slack_tools=slack_tools)
+        
+        # Act
+        await first._send_slack_message(channel="C1", text="one")
+        await second._send_slack_message(channel="C1", text="two")
+        
+        # Assert: both sends spent tokens from the one bucket
+        assert bucket._tokens < 1
+
+class TestKeywordRouting:
+    """Test cases for routing keyword normalization and matching."""
+    
+    @pytest.fixture(autouse=True)
+    def _clear_matcher_cache(self):
+        # Matchers are cached by keywords alone, not by which backend built them
+        _build_keyword_matcher.cache_clear()
+        yield
+        _build_keyword_matcher.cache_clear()
+    
+    @pytest.mark.parametrize(
+        "keywords,expected",
+        [
+            (("Urgent", "BUG"), frozenset({"urgent", "bug"})),
+            (("", "bug"), frozenset({"bug"})),
+            (("  ", "\t", "bug"), frozenset({"bug"})),
+            (("", " "), frozenset()),
+        ],
+        ids=["lowercased", "empty_dropped", "whitespace_dropped", "all_blank"]
+    )
+    def test_normalize_keywords(self, keywords, expected):
+        """Test keywords are lowercased and blank ones dropped."""
+        assert _normalize_keywords(keywords) == expected
+    
+    @pytest.mark.parametrize(
+        "use_automaton",
+        [True, False],
+        ids=["aho_corasick", "substring_fallback"]
+    )
+    def test_keyword_matcher(self, use_automaton):
+        """Test both matcher backends report the same rule indexes."""
+        # Arrange
+        if use_automaton:
+            pytest.importorskip("ahocorasick")
+            backend = contextlib.nullcontext()
+        else:
+            backend = patch.object(workflow_tools, "ahocorasick", None)
+        rule_keywords = (
+            _normalize_keywords(("urgent", "bug")),
+            _normalize_keywords(("", "  ")),
+            _normalize_keywords(("deploy",)),
+        )
+        
+        # Act
+        with backend:
+            match = _build_keyword_matcher(rule_keywords)
+            hits = match("urgent: deploy failed")
+            misses = match("nothing to see here")
+        
+        # Assert
+        assert hits == {0, 2}
+        assert misses == set()